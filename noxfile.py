@@ -49,6 +49,12 @@ def coverage_report(session: nox.Session) -> None:
     session.run("coverage", "report")
 
 
+@nox.session
+def benchmark(session: nox.Session) -> None:
+    session.install(".")
+    session.run("python", "-m", "towncrier.test.benchmark", *session.posargs)
+
+
 @nox.session
 def check_newsfragment(session: nox.Session) -> None:
     session.install(".")
@@ -3,4 +3,6 @@ from __future__ import annotations
 from towncrier._shell import cli
 
 
-cli()
+# Worker processes started with "spawn" import this module under another name.
+if __name__ == "__main__":
+    cli()
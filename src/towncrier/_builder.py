@@ -4,21 +4,51 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import re
 import textwrap
 
-from collections import defaultdict
-from fnmatch import fnmatch
-from pathlib import Path
-from typing import Any, DefaultDict, Iterable, Iterator, Mapping, NamedTuple, Sequence
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import translate
+from functools import lru_cache, partial
+from itertools import repeat
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    cast,
+)
 
 from click import ClickException
-from jinja2 import Template
 
+from towncrier import _timings
 from towncrier._settings.load import Config
 
 
+if TYPE_CHECKING:
+    # Jinja is only imported when rendering, as it's slow to import and most commands
+    # don't need it.
+    from jinja2 import Environment, Template
+
+    from towncrier._cache import FragmentCache
+
+
+re_wildcard = re.compile(r"[*?[]")
+re_digits = re.compile(r"\d+")
+# Starting worker processes costs more than preparing fewer fragments than this.
+_MIN_PARALLEL_FRAGMENTS = 2000
+# Whitespace other than spaces, which `textwrap` replaces before wrapping.
+re_textwrap_whitespace = re.compile(r"[\t\n\x0b\x0c\r]")
+
+
 # Returns issue, category and counter or (None, None, None) if the basename
 # could not be parsed or doesn't contain a valid category.
 def parse_newfragment_basename(
@@ -87,6 +117,248 @@ class FragmentsPath:
         )
 
 
+class IgnoredFiles:
+    """
+    A matcher for the files in a fragments directory that aren't news fragments.
+
+    This is a callable that takes the base name of a file and returns whether it is
+    ignored. The patterns are compiled once: plain names are looked up in a set and
+    all the `fnmatch` wildcard patterns are combined into a single regular
+    expression.
+    """
+
+    default_names = (
+        ".gitignore",
+        ".gitkeep",
+        ".keep",
+        "readme",
+        "readme.md",
+        "readme.rst",
+    )
+
+    def __init__(self, config: Config):
+        patterns = set(self.default_names)
+        if isinstance(config.template, str):
+            # Template can be a tuple of (package_name, resource_name).
+            #
+            # See https://github.com/twisted/towncrier/issues/634
+            patterns.add(os.path.basename(config.template))
+        if config.ignore:
+            patterns.update(filename.lower() for filename in config.ignore)
+
+        self.names: set[str] = set()
+        wildcards = []
+        for pattern in patterns:
+            # Normalize the same way as `fnmatch.fnmatch` does.
+            pattern = os.path.normcase(pattern)
+            if re_wildcard.search(pattern):
+                wildcards.append(translate(pattern))
+            else:
+                self.names.add(pattern)
+        self.wildcards = re.compile("|".join(wildcards)) if wildcards else None
+
+    def __call__(self, basename: str) -> bool:
+        name = os.path.normcase(basename.lower())
+        if name in self.names:
+            return True
+        return self.wildcards is not None and self.wildcards.match(name) is not None
+
+
+class FragmentFile(NamedTuple):
+    """
+    A news fragment found on disk, before its content has been read.
+    """
+
+    section: str
+    path: str
+    issue: str
+    category: str
+    counter: int
+
+
+def _iter_fragment_entries(section_dir: str) -> Iterator[os.DirEntry[str]]:
+    """
+    Yield the regular files in *section_dir*.
+
+    A missing directory has no files. Directories and other non-regular entries
+    are skipped using the file type reported by the directory listing, so this
+    doesn't need a `stat` call per file on most platforms.
+    """
+    try:
+        with os.scandir(section_dir) as entries:
+            for entry in entries:
+                _timings.count("files scanned")
+                if entry.is_file():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def discover_fragments(
+    base_directory: str,
+    config: Config,
+    strict: bool,
+) -> list[FragmentFile]:
+    """
+    Find the news fragments of all the sections without reading their content.
+
+    If strict, raise ClickException if any fragments have an invalid name.
+    """
+    is_ignored = IgnoredFiles(config)
+    get_section_path = FragmentsPath(base_directory, config)
+
+    fragment_files = []
+    # Multiple orphan news fragments are allowed per section, so initialize a counter
+    # that can be incremented automatically.
+    orphan_fragment_counter: DefaultDict[str | None, int] = defaultdict(int)
+
+    for key, section_dir in config.sections.items():
+        section_dir = get_section_path(section_dir)
+        seen: set[tuple[str, str, int]] = set()
+
+        for entry in _iter_fragment_entries(section_dir):
+            parsed = _parse_fragment_name(entry.name, config, is_ignored, strict)
+            if parsed is None:
+                continue
+            issue, category, counter = parsed
+            if not issue:
+                # Use and increment the orphan news fragment counter.
+                counter = orphan_fragment_counter[category]
+                orphan_fragment_counter[category] += 1
+
+            if (issue, category, counter) in seen:
+                raise ValueError(
+                    "multiple files for {}.{} in {}".format(
+                        issue, category, section_dir
+                    )
+                )
+            seen.add((issue, category, counter))
+
+            fragment_files.append(
+                FragmentFile(key, entry.path, issue, category, counter)
+            )
+
+    return fragment_files
+
+
+def classify_fragments(
+    base_directory: str,
+    config: Config,
+    paths: Iterable[str],
+    strict: bool,
+) -> list[FragmentFile]:
+    """
+    Return the news fragments among the absolute *paths*, without looking at the
+    other files of the fragment directories.
+
+    If strict, raise ClickException if any of them have an invalid name.
+    """
+    is_ignored = IgnoredFiles(config)
+    get_section_path = FragmentsPath(base_directory, config)
+    sections = {
+        os.path.normpath(get_section_path(section_dir)): key
+        for key, section_dir in config.sections.items()
+    }
+
+    fragment_files = []
+    for path in paths:
+        key = sections.get(os.path.dirname(path))
+        if key is None or not os.path.isfile(path):
+            continue
+        parsed = _parse_fragment_name(
+            os.path.basename(path), config, is_ignored, strict
+        )
+        if parsed is not None:
+            fragment_files.append(FragmentFile(key, path, *parsed))
+
+    return fragment_files
+
+
+def _parse_fragment_name(
+    basename: str, config: Config, is_ignored: IgnoredFiles, strict: bool
+) -> tuple[str, str, int] | None:
+    """
+    Parse the name of a file of a fragments directory into its issue, category and
+    counter, or return None if it isn't a news fragment.
+
+    Orphan news fragments have an empty issue.
+    """
+    if is_ignored(basename):
+        return None
+
+    issue, category, counter = parse_newfragment_basename(basename, config.types)
+    if category is None:
+        if strict and issue is None:
+            raise ClickException(
+                f"Invalid news fragment name: {basename}\n"
+                "If this filename is deliberate, add it to "
+                "'ignore' in your configuration."
+            )
+        return None
+    assert issue is not None
+    assert counter is not None
+    if config.orphan_prefix and issue.startswith(config.orphan_prefix):
+        issue = ""
+
+    if (
+        config.issue_pattern
+        and issue  # not orphan
+        and not re.fullmatch(config.issue_pattern, issue)
+    ):
+        raise ClickException(
+            f"Issue name '{issue}' does not match the "
+            f"configured pattern, '{config.issue_pattern}'"
+        )
+    return issue, category, counter
+
+
+def read_fragment(path: str) -> str:
+    """
+    Read the content of the news fragment at *path*.
+
+    Newlines are translated like in text mode.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    _timings.count("bytes read", len(data))
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_fragments(
+    paths: Sequence[str], jobs: int = 1, cache: FragmentCache | None = None
+) -> list[str]:
+    """
+    Read the content of the news fragments at *paths*, in the same order.
+
+    With more than one job, the files are read concurrently by up to *jobs* threads,
+    which hides the latency of slow (e.g. network) filesystems.
+
+    When a *cache* is given, only the files that changed since they were cached are
+    read.
+    """
+    if cache is None:
+        return _read_fragments(paths, jobs)
+
+    stats = [os.stat(path) for path in paths]
+    contents = [cache.get(path, stat) for path, stat in zip(paths, stats)]
+    missing = [i for i, content in enumerate(contents) if content is None]
+    _timings.count("fragments from cache", len(paths) - len(missing))
+    for i, content in zip(missing, _read_fragments([paths[i] for i in missing], jobs)):
+        cache.put(paths[i], stats[i], content)
+        contents[i] = content
+
+    return cast("list[str]", contents)
+
+
+def _read_fragments(paths: Sequence[str], jobs: int) -> list[str]:
+    if jobs <= 1 or len(paths) <= 1:
+        return [read_fragment(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(read_fragment, paths))
+
+
 # Returns a structure like:
 #
 # {
@@ -109,96 +381,49 @@ def find_fragments(
     base_directory: str,
     config: Config,
     strict: bool,
+    jobs: int | None = None,
+    cache: FragmentCache | None = None,
 ) -> tuple[Mapping[str, Mapping[tuple[str, str, int], str]], list[tuple[str, str]]]:
     """
     Sections are a dictonary of section names to paths.
 
     If strict, raise ClickException if any fragments have an invalid name.
-    """
-    ignored_files = {
-        ".gitignore",
-        ".gitkeep",
-        ".keep",
-        "readme",
-        "readme.md",
-        "readme.rst",
-    }
-    if isinstance(config.template, str):
-        # Template can be a tuple of (package_name, resource_name).
-        #
-        # See https://github.com/twisted/towncrier/issues/634
-        ignored_files.add(os.path.basename(config.template))
-    if config.ignore:
-        ignored_files.update(filename.lower() for filename in config.ignore)
 
-    get_section_path = FragmentsPath(base_directory, config)
+    The fragments are read by *jobs* threads, which defaults to the `jobs` option of
+    the configuration. Unchanged fragments are taken from the *cache*, if given.
 
-    content = {}
-    fragment_files = []
-    # Multiple orphan news fragments are allowed per section, so initialize a counter
-    # that can be incremented automatically.
-    orphan_fragment_counter: DefaultDict[str | None, int] = defaultdict(int)
-
-    for key, section_dir in config.sections.items():
-        section_dir = get_section_path(section_dir)
-
-        try:
-            files = os.listdir(section_dir)
-        except FileNotFoundError:
-            files = []
-
-        file_content = {}
-
-        for basename in files:
-            if any(
-                [
-                    fnmatch(basename.lower(), ignore_pattern)
-                    for ignore_pattern in ignored_files
-                ]
-            ):
-                continue
-
-            issue, category, counter = parse_newfragment_basename(
-                basename, config.types
-            )
-            if category is None:
-                if strict and issue is None:
-                    raise ClickException(
-                        f"Invalid news fragment name: {basename}\n"
-                        "If this filename is deliberate, add it to "
-                        "'ignore' in your configuration."
-                    )
-                continue
-            assert issue is not None
-            assert counter is not None
-            if config.orphan_prefix and issue.startswith(config.orphan_prefix):
-                issue = ""
-                # Use and increment the orphan news fragment counter.
-                counter = orphan_fragment_counter[category]
-                orphan_fragment_counter[category] += 1
+    Use `discover_fragments` instead when the content of the fragments isn't needed.
+    """
+    content, fragment_files = find_fragment_files(
+        base_directory, config, strict, jobs=jobs, cache=cache
+    )
+    return content, [(fragment.path, fragment.category) for fragment in fragment_files]
 
-            if (
-                config.issue_pattern
-                and issue  # not orphan
-                and not re.fullmatch(config.issue_pattern, issue)
-            ):
-                raise ClickException(
-                    f"Issue name '{issue}' does not match the "
-                    f"configured pattern, '{config.issue_pattern}'"
-                )
-            full_filename = os.path.join(section_dir, basename)
-            fragment_files.append((full_filename, category))
-            data = Path(full_filename).read_text(encoding="utf-8", errors="replace")
 
-            if (issue, category, counter) in file_content:
-                raise ValueError(
-                    "multiple files for {}.{} in {}".format(
-                        issue, category, section_dir
-                    )
-                )
-            file_content[issue, category, counter] = data
+def find_fragment_files(
+    base_directory: str,
+    config: Config,
+    strict: bool,
+    jobs: int | None = None,
+    cache: FragmentCache | None = None,
+) -> tuple[Mapping[str, Mapping[tuple[str, str, int], str]], list[FragmentFile]]:
+    """
+    Like `find_fragments`, but return the full `FragmentFile` of each fragment.
+    """
+    fragment_files = discover_fragments(base_directory, config, strict)
+    fragment_contents = read_fragments(
+        [fragment.path for fragment in fragment_files],
+        jobs=config.jobs if jobs is None else jobs,
+        cache=cache,
+    )
 
-        content[key] = file_content
+    content: dict[str, dict[tuple[str, str, int], str]] = {
+        key: {} for key in config.sections
+    }
+    for fragment, data in zip(fragment_files, fragment_contents):
+        content[fragment.section][
+            fragment.issue, fragment.category, fragment.counter
+        ] = data
 
     return content, fragment_files
 
@@ -223,29 +448,21 @@ def split_fragments(
     fragments: Mapping[str, Mapping[tuple[str, str, int], str]],
     definitions: Mapping[str, Mapping[str, Any]],
     all_bullets: bool = True,
+    issue_memo: IssueMemo | None = None,
 ) -> Mapping[str, Mapping[str, Mapping[str, Sequence[str]]]]:
+    """
+    Group the fragments of each section by category and text.
+
+    The issues of each text are sorted alphabetically, or in the order used for
+    rendering if an *issue_memo* is given.
+    """
     output = {}
 
     for section_name, section_fragments in fragments.items():
         section: dict[str, dict[str, list[str]]] = {}
 
         for (issue, category, counter), content in section_fragments.items():
-            if all_bullets:
-                # By default all fragmetns are append by "-" automatically,
-                # and need to be indented because of that.
-                # (otherwise, assume they are formatted correctly)
-                content = indent(content.strip(), "  ")[2:]
-            else:
-                # Assume the text is formatted correctly
-                content = content.rstrip()
-
-            if definitions[category]["showcontent"] is False and issue:
-                # If this category is not supposed to show content (and we have an
-                # issue) then we should just add the issue to the section rather than
-                # the content. If there isn't an issue, still add the content so that
-                # it's recorded.
-                content = ""
-
+            content = entry_text(content, issue, definitions[category], all_bullets)
             texts = section.setdefault(category, {})
 
             issues = texts.setdefault(content, [])
@@ -253,13 +470,95 @@ def split_fragments(
                 # Only add the issue if we have one (it can be blank for orphan news
                 # fragments).
                 issues.append(issue)
-                issues.sort()
+
+        # Sort the issues once all of them are collected, as many fragments can
+        # share the same text (e.g. when their content is not shown).
+        for texts in section.values():
+            for issues in texts.values():
+                issues.sort(key=None if issue_memo is None else issue_memo.key)
 
         output[section_name] = section
 
     return output
 
 
+def entry_text(
+    content: str, issue: str, definition: Mapping[str, Any], all_bullets: bool
+) -> str:
+    """
+    Return the text of the entry of a news fragment with the given *content*.
+    """
+    if all_bullets:
+        # By default all fragmetns are append by "-" automatically,
+        # and need to be indented because of that.
+        # (otherwise, assume they are formatted correctly)
+        content = indent(content.strip(), "  ")[2:]
+    else:
+        # Assume the text is formatted correctly
+        content = content.rstrip()
+
+    if definition["showcontent"] is False and issue:
+        # If this category is not supposed to show content (and we have an
+        # issue) then we should just add the issue to the section rather than
+        # the content. If there isn't an issue, still add the content so that
+        # it's recorded.
+        content = ""
+
+    return content
+
+
+def fragments_as_data(
+    fragments: Mapping[str, Mapping[str, Mapping[str, Sequence[str]]]],
+    definitions: Mapping[str, Mapping[str, Any]],
+    fragment_files: Iterable[FragmentFile],
+    fragment_contents: Mapping[str, Mapping[tuple[str, str, int], str]],
+    all_bullets: bool = True,
+    issue_memo: IssueMemo | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Return the fragments grouped by `split_fragments` as plain data, in the order
+    they are rendered, with the paths of the news fragments of each entry.
+    """
+    if issue_memo is None:
+        issue_memo = IssueMemo(None)
+
+    paths: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+    for fragment in fragment_files:
+        content = fragment_contents[fragment.section][
+            fragment.issue, fragment.category, fragment.counter
+        ]
+        text = entry_text(
+            content, fragment.issue, definitions[fragment.category], all_bullets
+        )
+        paths[fragment.section, fragment.category, text].append(fragment.path)
+
+    sections = []
+    for section_name, section_value in fragments.items():
+        categories = []
+        for category_name in definitions:
+            if category_name not in section_value:
+                continue
+            entries = sort_entries(
+                section_value[category_name], issue_memo, all_bullets
+            )
+            categories.append(
+                {
+                    "category": category_name,
+                    "name": definitions[category_name]["name"],
+                    "entries": [
+                        {
+                            "text": text,
+                            "issues": issues,
+                            "files": sorted(paths[section_name, category_name, text]),
+                        }
+                        for text, issues in entries
+                    ],
+                }
+            )
+        sections.append({"name": section_name, "categories": categories})
+    return sections
+
+
 class IssueParts(NamedTuple):
     is_digit: bool
     has_digit: bool
@@ -285,7 +584,7 @@ def issue_key(issue: str) -> IssueParts:
         return IssueParts(
             is_digit=True, has_digit=True, non_digit_part="", number=int(issue)
         )
-    match = re.search(r"\d+", issue)
+    match = re_digits.search(issue)
     if not match:
         return IssueParts(
             is_digit=False, has_digit=False, non_digit_part=issue, number=-1
@@ -298,10 +597,13 @@ def issue_key(issue: str) -> IssueParts:
     )
 
 
-def entry_key(entry: tuple[str, Sequence[str]]) -> tuple[str, list[IssueParts]]:
+def entry_key(
+    entry: tuple[str, Sequence[str]],
+    key: Callable[[str], IssueParts] = issue_key,
+) -> tuple[str, list[IssueParts]]:
     content, issues = entry
     # Orphan news fragments (those without any issues) should sort last by content.
-    return "" if issues else content, [issue_key(issue) for issue in issues]
+    return "" if issues else content, [key(issue) for issue in issues]
 
 
 def bullet_key(entry: tuple[str, Sequence[str]]) -> int:
@@ -328,6 +630,226 @@ def render_issue(issue_format: str | None, issue: str) -> str:
         return issue_format.format(issue=issue)
 
 
+# The number of compiled templates kept by each environment, and of their sources.
+_TEMPLATE_CACHE_SIZE = 400
+# Sources of the templates compiled by `get_template`, keyed by their hash, least
+# recently used first.
+_template_sources: OrderedDict[str, str] = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _get_environment(bytecode_cache_dir: str | None) -> Environment:
+    from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return Environment(
+        loader=FunctionLoader(_template_sources.get),
+        trim_blocks=True,
+        cache_size=_TEMPLATE_CACHE_SIZE,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def get_template(template: str, bytecode_cache_dir: str | None = None) -> Template:
+    """
+    Return the compiled Jinja template for the *template* source.
+
+    Templates are compiled once per process and looked up by the hash of their
+    source; only the most recently used ones are kept. If *bytecode_cache_dir* is
+    given, the compiled code is also stored there, so later processes don't need to
+    compile the template again.
+    """
+    name = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    _template_sources[name] = template
+    _template_sources.move_to_end(name)
+    while len(_template_sources) > _TEMPLATE_CACHE_SIZE:
+        _template_sources.popitem(last=False)
+    return _get_environment(bytecode_cache_dir).get_template(name)
+
+
+class IssueMemo:
+    """
+    Memoize the sort key and the rendered form of issues.
+
+    Use one instance per render, so each distinct issue is parsed by `issue_key` and
+    formatted by `render_issue` only once, however many times it's used.
+    """
+
+    def __init__(self, issue_format: str | None):
+        self.issue_format = issue_format
+        self.keys: dict[str, IssueParts] = {}
+        self.rendered: dict[str, str] = {}
+
+    def key(self, issue: str) -> IssueParts:
+        try:
+            return self.keys[issue]
+        except KeyError:
+            key = self.keys[issue] = issue_key(issue)
+            return key
+
+    def render(self, issue: str) -> str:
+        try:
+            return self.rendered[issue]
+        except KeyError:
+            rendered = self.rendered[issue] = render_issue(self.issue_format, issue)
+            return rendered
+
+
+def sort_entries(
+    texts: Mapping[str, Sequence[str]], issue_memo: IssueMemo, all_bullets: bool
+) -> list[tuple[str, list[str]]]:
+    """
+    Return the entries of a category as (text, issues) pairs, in rendering order.
+    """
+    # Suppose we start with an ordering like this:
+    #
+    # - Fix the thing (#7, #123, #2)
+    # - Fix the other thing (#1)
+
+    # First we sort the issues inside each line:
+    #
+    # - Fix the thing (#2, #7, #123)
+    # - Fix the other thing (#1)
+    entries = [
+        (text, sorted(issues, key=issue_memo.key)) for text, issues in texts.items()
+    ]
+
+    # Then we sort the lines:
+    #
+    # - Fix the other thing (#1)
+    # - Fix the thing (#2, #7, #123)
+    entries.sort(key=partial(entry_key, key=issue_memo.key))
+    if not all_bullets:
+        entries.sort(key=bullet_key)
+    return entries
+
+
+def wrap_line(line: str, width: int, subsequent_indent: str) -> str:
+    """
+    Wrap a single line of rendered output to *width* columns.
+    """
+    if (
+        len(line) <= width
+        and not line[-1:].isspace()
+        and not re_textwrap_whitespace.search(line)
+    ):
+        # Most lines (blank lines, headers, short entries) already fit, and
+        # `textwrap` would return them unchanged.
+        return line
+    return textwrap.fill(
+        line,
+        width=width,
+        subsequent_indent=subsequent_indent,
+        break_long_words=False,
+        break_on_hyphens=False,
+    )
+
+
+class PreparedSection(NamedTuple):
+    """
+    The data of a section given to the template.
+    """
+
+    # The entries of each category, in rendering order, with their rendered issues.
+    entries: Mapping[str, Mapping[str, Sequence[str]]]
+    # All the rendered issues of each category.
+    issues: Mapping[str, Sequence[str]]
+
+
+def prepare_section(
+    section: Mapping[str, Mapping[str, Sequence[str]]],
+    issue_memo: IssueMemo,
+    all_bullets: bool,
+) -> PreparedSection:
+    """
+    Sort the entries of a section from `split_fragments` and render their issues.
+    """
+    entries: dict[str, dict[str, list[str]]] = {}
+    issues_by_category: dict[str, list[str]] = {}
+
+    for category_name, category_value in section.items():
+        category_issues: set[str] = set()
+        for issues in category_value.values():
+            category_issues.update(issues)
+
+        # Then we put these nicely sorted entries back in an ordered dict
+        # for the template, after formatting each issue number
+        entries[category_name] = {
+            text: [issue_memo.render(i) for i in issues]
+            for text, issues in sort_entries(category_value, issue_memo, all_bullets)
+        }
+        issues_by_category[category_name] = [
+            issue_memo.render(i) for i in sorted(category_issues, key=issue_memo.key)
+        ]
+
+    return PreparedSection(entries, issues_by_category)
+
+
+def prepare_fragments(
+    fragments: Mapping[tuple[str, str, int], str],
+    definitions: Mapping[str, Mapping[str, Any]],
+    all_bullets: bool,
+    issue_memo: IssueMemo,
+) -> PreparedSection:
+    """
+    Group and prepare the news fragments of a single section, keyed by issue,
+    category and counter, see `split_fragments` and `prepare_section`.
+    """
+    section = split_fragments(
+        {"": fragments}, definitions, all_bullets=all_bullets, issue_memo=issue_memo
+    )[""]
+    return prepare_section(section, issue_memo, all_bullets)
+
+
+def prepare_sections(
+    sections: Mapping[str, Mapping[tuple[str, str, int], str]],
+    definitions: Mapping[str, Mapping[str, Any]],
+    all_bullets: bool,
+    issue_format: str | None,
+    jobs: int = 1,
+) -> dict[str, PreparedSection]:
+    """
+    Prepare the news fragments of each section, see `prepare_fragments`.
+
+    With more than one job, the sections are prepared concurrently by up to *jobs*
+    processes, one per section and CPU at most, but only when there are enough news
+    fragments for it to pay off.
+    The result is the same, in the same order, either way.
+    """
+    workers = min(jobs, len(sections), os.cpu_count() or 1)
+    if workers <= 1 or sum(map(len, sections.values())) < _MIN_PARALLEL_FRAGMENTS:
+        issue_memo = IssueMemo(issue_format)
+        return {
+            name: prepare_fragments(fragments, definitions, all_bullets, issue_memo)
+            for name, fragments in sections.items()
+        }
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        prepared = executor.map(
+            _prepare_fragments_in_process,
+            sections.values(),
+            repeat(definitions),
+            repeat(all_bullets),
+            repeat(issue_format),
+        )
+        return dict(zip(sections, prepared))
+
+
+def _prepare_fragments_in_process(
+    fragments: Mapping[tuple[str, str, int], str],
+    definitions: Mapping[str, Mapping[str, Any]],
+    all_bullets: bool,
+    issue_format: str | None,
+) -> PreparedSection:
+    # The memo can't be shared between processes.
+    return prepare_fragments(
+        fragments, definitions, all_bullets, IssueMemo(issue_format)
+    )
+
+
 def render_fragments(
     template: str,
     issue_format: str | None,
@@ -339,56 +861,60 @@ def render_fragments(
     top_underline: str = "=",
     all_bullets: bool = False,
     render_title: bool = True,
+    bytecode_cache_dir: str | None = None,
+    issue_memo: IssueMemo | None = None,
+    wrap_width: int = 79,
 ) -> str:
     """
     Render the fragments into a news file.
-    """
 
-    jinja_template = Template(template, trim_blocks=True)
+    If *wrap* is true, lines longer than *wrap_width* are wrapped.
 
-    data: dict[str, dict[str, dict[str, list[str]]]] = {}
-    issues_by_category: dict[str, dict[str, list[str]]] = {}
+    Pass the *issue_memo* already used by `split_fragments` to reuse its work.
+    """
+    if issue_memo is None:
+        issue_memo = IssueMemo(issue_format)
 
-    for section_name, section_value in fragments.items():
-        data[section_name] = {}
-        issues_by_category[section_name] = {}
+    sections = {
+        section_name: prepare_section(section_value, issue_memo, all_bullets)
+        for section_name, section_value in fragments.items()
+    }
+    return render_sections(
+        template,
+        sections,
+        definitions,
+        underlines,
+        wrap,
+        versiondata,
+        top_underline=top_underline,
+        all_bullets=all_bullets,
+        render_title=render_title,
+        bytecode_cache_dir=bytecode_cache_dir,
+        wrap_width=wrap_width,
+    )
 
-        for category_name, category_value in section_value.items():
-            category_issues: set[str] = set()
-            # Suppose we start with an ordering like this:
-            #
-            # - Fix the thing (#7, #123, #2)
-            # - Fix the other thing (#1)
 
-            # First we sort the issues inside each line:
-            #
-            # - Fix the thing (#2, #7, #123)
-            # - Fix the other thing (#1)
-            entries = []
-            for text, issues in category_value.items():
-                entries.append((text, sorted(issues, key=issue_key)))
-                category_issues.update(issues)
-
-            # Then we sort the lines:
-            #
-            # - Fix the other thing (#1)
-            # - Fix the thing (#2, #7, #123)
-            entries.sort(key=entry_key)
-            if not all_bullets:
-                entries.sort(key=bullet_key)
-
-            # Then we put these nicely sorted entries back in an ordered dict
-            # for the template, after formatting each issue number
-            categories = {}
-            for text, issues in entries:
-                rendered = [render_issue(issue_format, i) for i in issues]
-                categories[text] = rendered
-
-            data[section_name][category_name] = categories
-            issues_by_category[section_name][category_name] = [
-                render_issue(issue_format, i)
-                for i in sorted(category_issues, key=issue_key)
-            ]
+def render_sections(
+    template: str,
+    sections: Mapping[str, PreparedSection],
+    definitions: Mapping[str, Mapping[str, Any]],
+    underlines: Sequence[str],
+    wrap: bool,
+    versiondata: Mapping[str, str],
+    top_underline: str = "=",
+    all_bullets: bool = False,
+    render_title: bool = True,
+    bytecode_cache_dir: str | None = None,
+    wrap_width: int = 79,
+) -> str:
+    """
+    Render the sections prepared by `prepare_section` into a news file.
+
+    See `render_fragments`.
+    """
+    jinja_template = get_template(template, bytecode_cache_dir)
+    data = {name: section.entries for name, section in sections.items()}
+    issues_by_category = {name: section.issues for name, section in sections.items()}
 
     done = []
 
@@ -415,15 +941,7 @@ def render_fragments(
 
     for line in res.split("\n"):
         if wrap:
-            done.append(
-                textwrap.fill(
-                    line,
-                    width=79,
-                    subsequent_indent=get_indent(line),
-                    break_long_words=False,
-                    break_on_hyphens=False,
-                )
-            )
+            done.append(wrap_line(line, wrap_width, get_indent(line)))
         else:
             done.append(line)
 
@@ -0,0 +1,233 @@
+"""
+Responsible for caching news fragments and compiled templates between runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from collections import OrderedDict
+from typing import Any, Sequence
+
+from ._builder import PreparedSection
+from ._project import _get_metadata_version
+from ._settings.load import Config
+
+
+# Files modified this recently may still change without their modification time
+# changing, when the filesystem has a coarse timestamp resolution.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class _JsonCache:
+    """
+    A persistent cache stored as a JSON file, along with a *signature* of what it
+    depends on.
+
+    A missing or corrupt file, or one with another signature, is the same as an
+    empty cache. Subclasses read and dump their entries, and set `changed` when
+    they need to be saved.
+    """
+
+    def __init__(self, path: str, signature: str):
+        self.path = path
+        self.signature = signature
+        self.changed = False
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            if data["signature"] == self.signature:
+                self._read(data["entries"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._clear()
+
+    def _read(self, entries: Any) -> None:
+        raise NotImplementedError()
+
+    def _clear(self) -> None:
+        raise NotImplementedError()
+
+    def _dump(self) -> Any:
+        raise NotImplementedError()
+
+    def save(self) -> None:
+        """
+        Write the cache back to disk, if it has changed.
+
+        The file is replaced atomically so concurrent runs never see a partial cache.
+        """
+        if not self.changed:
+            return
+
+        _write_json(self.path, {"signature": self.signature, "entries": self._dump()})
+        self.changed = False
+
+
+class FragmentCache(_JsonCache):
+    """
+    A persistent cache of the content of news fragments.
+
+    Entries are keyed by the path of the fragment and are only used while the
+    modification time and size of the file are unchanged. Once more than
+    *max_entries* are stored, the least recently used entries are evicted.
+    """
+
+    version = 1
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+        super().__init__(path, str(self.version))
+
+    def _read(self, entries: Any) -> None:
+        for path, mtime_ns, size, content in entries:
+            self.entries[path] = (mtime_ns, size, content)
+
+    def _clear(self) -> None:
+        self.entries.clear()
+
+    def _dump(self) -> Any:
+        return [[path, *entry] for path, entry in self.entries.items()]
+
+    def get(self, path: str, stat: os.stat_result) -> str | None:
+        """
+        Return the cached content of *path*, or None if the file has changed.
+        """
+        entry = self.entries.get(path)
+        if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+            return None
+        # The new order is only written back along with the next change.
+        self.entries.move_to_end(path)
+        return entry[2]
+
+    def put(self, path: str, stat: os.stat_result, content: str) -> None:
+        """
+        Store the *content* read from *path* when its status was *stat*.
+        """
+        if self.entries.pop(path, None) is not None:
+            self.changed = True
+        if time.time_ns() - stat.st_mtime_ns < _RACY_WINDOW_NS:
+            return
+        self.entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+        self.changed = True
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class SectionCache(_JsonCache):
+    """
+    A persistent cache of the sections prepared for the template by the last build.
+
+    A section is only reused while its news fragments have the same paths,
+    modification times and sizes, and the configuration is unchanged.
+    """
+
+    version = 1
+
+    def __init__(self, path: str, config: Config):
+        self.sections: dict[str, tuple[str, PreparedSection]] = {}
+        # Anything that changes how sections are prepared invalidates all of them.
+        signature = hashlib.sha256(
+            f"{self.version}\n{_get_metadata_version('towncrier')}\n{config!r}".encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        super().__init__(path, signature)
+
+    def _read(self, entries: Any) -> None:
+        for name, key, section_entries, issues in entries:
+            self.sections[name] = (key, PreparedSection(section_entries, issues))
+
+    def _clear(self) -> None:
+        self.sections.clear()
+
+    def _dump(self) -> Any:
+        return [[name, key, *section] for name, (key, section) in self.sections.items()]
+
+    def key(self, paths: Sequence[str]) -> str | None:
+        """
+        Return the key of a section with the news fragments at *paths*, or None if
+        some of them were modified too recently to be cached safely.
+        """
+        manifest = hashlib.sha256()
+        now = time.time_ns()
+        for path in sorted(paths):
+            stat = os.stat(path)
+            if now - stat.st_mtime_ns < _RACY_WINDOW_NS:
+                return None
+            manifest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+        return manifest.hexdigest()
+
+    def get(self, name: str, key: str | None) -> PreparedSection | None:
+        """
+        Return the prepared section *name*, or None if its news fragments changed.
+        """
+        cached = self.sections.get(name)
+        if key is None or cached is None or cached[0] != key:
+            return None
+        return cached[1]
+
+    def put(self, name: str, key: str | None, section: PreparedSection) -> None:
+        """
+        Store the prepared section *name*, if it has a *key*.
+        """
+        if key is None:
+            if self.sections.pop(name, None) is not None:
+                self.changed = True
+            return
+        self.sections[name] = (key, section)
+        self.changed = True
+
+
+def _write_json(path: str, data: Any) -> None:
+    """
+    Write *data* as JSON to *path*, replacing it atomically.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8") as cache_file:
+            json.dump(data, cache_file)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def get_fragment_cache(base_directory: str, config: Config) -> FragmentCache | None:
+    """
+    Return the fragment cache configured by `cache_dir`, or None if it's disabled.
+    """
+    if config.cache_dir is None:
+        return None
+    return FragmentCache(
+        os.path.join(base_directory, config.cache_dir, "fragments.json"),
+        config.cache_size,
+    )
+
+
+def get_section_cache(base_directory: str, config: Config) -> SectionCache | None:
+    """
+    Return the cache of prepared sections configured by `cache_dir`, or None if it's
+    disabled.
+    """
+    if config.cache_dir is None:
+        return None
+    return SectionCache(
+        os.path.join(base_directory, config.cache_dir, "sections.json"), config
+    )
+
+
+def get_template_cache_dir(base_directory: str, config: Config) -> str | None:
+    """
+    Return the directory for compiled templates configured by `cache_dir`, or None if
+    it's disabled.
+    """
+    if config.cache_dir is None:
+        return None
+    return os.path.join(base_directory, config.cache_dir, "templates")
@@ -5,34 +5,133 @@ from __future__ import annotations
 
 import os
 
-from subprocess import STDOUT, CalledProcessError, call, check_output
+from functools import partial
+from subprocess import (
+    PIPE,
+    STDOUT,
+    CalledProcessError,
+    Popen,
+    call,
+    check_call,
+    check_output,
+    run,
+)
+from tempfile import TemporaryFile
+from typing import Iterator, Sequence
 
+from . import _timings
+from ._git_reader import GitReader, UnsupportedRepository
 
-def remove_files(fragment_filenames: list[str]) -> None:
-    if not fragment_filenames:
-        return
 
-    # Filter out files that are unknown to git
+_CHUNK_SIZE = 64 * 1024
+
+
+def _list_tracked_files(directories: list[str]) -> list[str]:
+    """
+    Return the absolute paths of the files tracked by git in *directories*.
+
+    The index is read directly when its format is understood, and `git ls-files`
+    is run otherwise.
+    """
+    try:
+        return list(GitReader.discover(os.getcwd()).tracked_files())
+    except (OSError, ValueError, UnsupportedRepository):
+        pass
+
+    # List the files of the directories instead of passing every file on the
+    # command line, which has a limited length.
+    _timings.count("subprocesses")
     try:
-        git_fragments = check_output(
-            ["git", "ls-files"] + fragment_filenames, encoding="utf-8"
-        ).split("\n")
+        git_files = check_output(
+            ["git", "--literal-pathspecs", "ls-files", "-z", "--", *directories],
+            encoding="utf-8",
+        ).split("\0")
     except CalledProcessError:
         # we may not be in a git repository
-        git_fragments = []
+        return []
+    return [os.path.abspath(path) for path in git_files if path]
 
-    git_fragments = [os.path.abspath(f) for f in git_fragments if os.path.isfile(f)]
-    call(["git", "rm", "--quiet", "--force"] + git_fragments)
-    unknown_fragments = set(fragment_filenames) - set(git_fragments)
-    for unknown_fragment in unknown_fragments:
+
+def remove_files(fragment_filenames: list[str]) -> None:
+    if not fragment_filenames:
+        return
+
+    # Filter out files that are unknown to git.
+    directories = sorted({os.path.dirname(f) for f in fragment_filenames})
+    fragments = set(fragment_filenames)
+    tracked_fragments = {
+        path
+        for path in _list_tracked_files(directories)
+        if path in fragments and os.path.isfile(path)
+    }
+    if tracked_fragments:
+        paths = sorted(tracked_fragments)
+        # Paths are read from stdin, so there's no limit on their number.
+        _timings.count("subprocesses")
+        result = run(
+            [*_GIT_RM, "--pathspec-from-file=-", "--pathspec-file-nul"],
+            input="".join(f"{path}\0" for path in paths),
+            stdout=PIPE,
+            stderr=STDOUT,
+            encoding="utf-8",
+        )
+        if result.returncode:
+            # Reading paths from stdin needs git 2.26 or later, so pass them as
+            # arguments instead, as many at a time as the command line can hold.
+            for batch in _argv_batches(paths, _max_argv_length()):
+                _timings.count("subprocesses")
+                check_call([*_GIT_RM, "--", *batch])
+    for unknown_fragment in fragments - tracked_fragments:
         os.remove(unknown_fragment)
 
 
+_GIT_RM = ["git", "--literal-pathspecs", "rm", "--quiet", "--force"]
+
+
+def _max_argv_length() -> int:
+    """
+    Return how many bytes of arguments a command can be given, with some margin.
+    """
+    try:
+        limit = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        # Windows limits the command line to 32767 characters.
+        limit = 32767
+    # The environment shares the limit with the arguments.
+    environment = sum(len(key) + len(value) + 2 for key, value in os.environ.items())
+    return max(limit // 2 - environment, 4096)
+
+
+def _argv_batches(paths: Sequence[str], max_length: int) -> Iterator[list[str]]:
+    """
+    Split *paths* into batches of arguments that take at most *max_length* bytes.
+    """
+    batch: list[str] = []
+    length = 0
+    for path in paths:
+        # Each argument also takes a pointer and a terminating null byte.
+        size = len(os.fsencode(path)) + 9
+        if batch and length + size > max_length:
+            yield batch
+            batch, length = [], 0
+        batch.append(path)
+        length += size
+    if batch:
+        yield batch
+
+
 def stage_newsfile(directory: str, filename: str) -> None:
+    _timings.count("subprocesses")
     call(["git", "add", os.path.join(directory, filename)])
 
 
 def get_remote_branches(base_directory: str) -> list[str]:
+    try:
+        return GitReader.discover(base_directory).remote_branches()
+    except (OSError, ValueError, UnsupportedRepository):
+        pass
+
+    _timings.count("subprocesses")
     output = check_output(
         ["git", "branch", "-r"], cwd=base_directory, encoding="utf-8", stderr=STDOUT
     )
@@ -40,14 +139,52 @@ def get_remote_branches(base_directory: str) -> list[str]:
     return [branch.strip() for branch in output.strip().splitlines()]
 
 
+def has_changes_compared_to_branch(base_directory: str, compare_with: str) -> bool:
+    """
+    Return whether anything changed since the branch forked from *compare_with*.
+    """
+    args = ["git", "diff", "--quiet", compare_with + "..."]
+    _timings.count("subprocesses")
+    result = run(args, cwd=base_directory, stdout=PIPE, stderr=STDOUT)
+    if result.returncode not in (0, 1):
+        raise CalledProcessError(
+            result.returncode, args, output=result.stdout.decode("utf-8", "replace")
+        )
+    return result.returncode == 1
+
+
+def iter_changed_files_compared_to_branch(
+    base_directory: str, compare_with: str, paths: Sequence[str] = ()
+) -> Iterator[str]:
+    """
+    Yield the files changed since the branch forked from *compare_with*, limited to
+    *paths* if any are given.
+
+    The output of git is read as it's produced, so that a large diff is never held in
+    memory.
+    """
+    args = ["git", "--literal-pathspecs", "diff", "--name-only", "-z"]
+    args += [compare_with + "...", "--", *paths]
+    _timings.count("subprocesses")
+    with TemporaryFile() as errors:
+        with Popen(args, cwd=base_directory, stdout=PIPE, stderr=errors) as process:
+            assert process.stdout is not None
+            pending = b""
+            for chunk in iter(partial(process.stdout.read, _CHUNK_SIZE), b""):
+                *names, pending = (pending + chunk).split(b"\0")
+                yield from map(os.fsdecode, names)
+        if process.returncode:
+            errors.seek(0)
+            raise CalledProcessError(
+                process.returncode,
+                args,
+                output=errors.read().decode("utf-8", "replace"),
+            )
+
+
 def list_changed_files_compared_to_branch(
-    base_directory: str, compare_with: str
+    base_directory: str, compare_with: str, paths: Sequence[str] = ()
 ) -> list[str]:
-    output = check_output(
-        ["git", "diff", "--name-only", compare_with + "..."],
-        cwd=base_directory,
-        encoding="utf-8",
-        stderr=STDOUT,
+    return list(
+        iter_changed_files_compared_to_branch(base_directory, compare_with, paths)
     )
-
-    return output.strip().splitlines()
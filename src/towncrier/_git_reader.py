@@ -0,0 +1,249 @@
+"""
+Read the git index and references without running git.
+
+Only the common repository layouts are understood. Anything else raises
+`UnsupportedRepository`, so callers can fall back to running git instead, as they
+always do when the `TOWNCRIER_NO_GIT_READER` environment variable is set.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import struct
+
+from typing import Iterator
+
+
+# Environment variables that change where git finds the repository.
+_GIT_ENVIRONMENT = (
+    "GIT_DIR",
+    "GIT_WORK_TREE",
+    "GIT_INDEX_FILE",
+    "GIT_COMMON_DIR",
+    "GIT_OBJECT_DIRECTORY",
+)
+
+_INDEX_HEADER = struct.Struct(">4sLL")
+# ctime, mtime, dev, ino, mode, uid, gid and size, followed by the SHA-1 and flags.
+_ENTRY_MODE = struct.Struct(">L")
+_ENTRY_MODE_OFFSET = 24
+_ENTRY_FLAGS = struct.Struct(">H")
+_ENTRY_FLAGS_OFFSET = 60
+_ENTRY_FIXED_SIZE = 62
+_SHA1_SIZE = 20
+
+
+class UnsupportedRepository(Exception):
+    """
+    The repository isn't found or uses a format that isn't understood.
+    """
+
+
+class GitReader:
+    """
+    Read the state of the git repository with the given work tree and git directory.
+    """
+
+    def __init__(self, work_tree: str, git_dir: str, common_dir: str):
+        self.work_tree = work_tree
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self._check_config()
+
+    @classmethod
+    def discover(cls, directory: str) -> GitReader:
+        """
+        Find the repository containing *directory*, like git does.
+        """
+        if os.environ.get("TOWNCRIER_NO_GIT_READER"):
+            raise UnsupportedRepository("Disabled by TOWNCRIER_NO_GIT_READER.")
+        if any(name in os.environ for name in _GIT_ENVIRONMENT):
+            raise UnsupportedRepository("The repository is set by the environment.")
+
+        directory = os.path.abspath(directory)
+        while True:
+            dot_git = os.path.join(directory, ".git")
+            if os.path.isdir(dot_git):
+                git_dir = dot_git
+                break
+            if os.path.isfile(dot_git):
+                # Linked work trees and submodules point to their git directory.
+                git_dir = _read_pointer(dot_git, "gitdir: ")
+                git_dir = os.path.normpath(os.path.join(directory, git_dir))
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                raise UnsupportedRepository("No git repository found.")
+            directory = parent
+
+        common_dir = git_dir
+        commondir_file = os.path.join(git_dir, "commondir")
+        if os.path.isfile(commondir_file):
+            common_dir = os.path.normpath(
+                os.path.join(git_dir, _read_pointer(commondir_file, ""))
+            )
+        return cls(directory, git_dir, common_dir)
+
+    def _check_config(self) -> None:
+        """
+        Reject the repositories whose configuration changes how the index and
+        references are stored or matched.
+        """
+        section = ""
+        try:
+            with open(
+                os.path.join(self.common_dir, "config"), encoding="utf-8"
+            ) as config:
+                lines = config.read().splitlines()
+        except (OSError, UnicodeDecodeError) as e:
+            raise UnsupportedRepository(f"Can't read the configuration: {e}")
+
+        for line in lines:
+            line = line.strip()
+            if line.startswith("["):
+                section = "".join(line[1:].split("]")[0].split()[:1]).lower()
+                if section in ("extensions", "include", "includeif"):
+                    raise UnsupportedRepository(f"Unsupported [{section}] section.")
+                continue
+            key, _, value = line.partition("=")
+            key = key.strip().lower()
+            value = value.strip().lower()
+            if section == "core" and (
+                key == "worktree"
+                or key in ("bare", "ignorecase")
+                and value not in ("false", "no", "off", "0")
+            ):
+                raise UnsupportedRepository(f"Unsupported core.{key} setting.")
+
+        if os.path.exists(os.path.join(self.common_dir, "reftable")):
+            raise UnsupportedRepository("Unsupported reftable references.")
+
+    def tracked_files(self) -> set[str]:
+        """
+        Return the absolute paths of the files in the index.
+        """
+        try:
+            with open(os.path.join(self.git_dir, "index"), "rb") as index:
+                data = index.read()
+        except FileNotFoundError:
+            # Nothing was ever added.
+            return set()
+
+        return {
+            os.path.join(self.work_tree, os.fsdecode(path).replace("/", os.sep))
+            for path in _parse_index(data)
+        }
+
+    def remote_branches(self) -> list[str]:
+        """
+        Return the remote tracking branches, formatted like `git branch -r` does.
+        """
+        refs: dict[str, str | None] = {}
+        packed_refs = os.path.join(self.common_dir, "packed-refs")
+        if os.path.isfile(packed_refs):
+            with open(packed_refs, encoding="utf-8") as packed:
+                for line in packed:
+                    if line.startswith(("#", "^")):
+                        continue
+                    _, _, name = line.rstrip("\n").partition(" ")
+                    if name.startswith("refs/remotes/"):
+                        refs[name] = None
+
+        # Loose references take precedence over packed ones.
+        remotes = os.path.join(self.common_dir, "refs", "remotes")
+        for path in _walk_files(remotes):
+            name = "refs/remotes/" + os.path.relpath(path, remotes).replace(os.sep, "/")
+            with open(path, encoding="utf-8") as ref:
+                content = ref.read().strip()
+            refs[name] = content[5:] if content.startswith("ref: ") else None
+
+        branches = []
+        for name, target in sorted(refs.items()):
+            branch = name[len("refs/remotes/") :]
+            if target is not None:
+                if target.startswith("refs/remotes/"):
+                    target = target[len("refs/remotes/") :]
+                branch = f"{branch} -> {target}"
+            branches.append(branch)
+        return branches
+
+
+def _read_pointer(path: str, prefix: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content.startswith(prefix):
+        raise UnsupportedRepository(f"Unexpected content in {path}.")
+    return content[len(prefix) :]
+
+
+def _walk_files(directory: str) -> Iterator[str]:
+    for root, _, files in os.walk(directory):
+        for name in files:
+            yield os.path.join(root, name)
+
+
+def _parse_index(data: bytes) -> Iterator[bytes]:
+    """
+    Yield the paths stored in the git index *data*.
+
+    See https://git-scm.com/docs/index-format
+    """
+    try:
+        signature, version, count = _INDEX_HEADER.unpack_from(data)
+    except struct.error:
+        raise UnsupportedRepository("Truncated index.")
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise UnsupportedRepository(f"Unsupported index version {version}.")
+
+    pos = _INDEX_HEADER.size
+    path = b""
+    try:
+        for _ in range(count):
+            entry_start = pos
+            (mode,) = _ENTRY_MODE.unpack_from(data, pos + _ENTRY_MODE_OFFSET)
+            (flags,) = _ENTRY_FLAGS.unpack_from(data, pos + _ENTRY_FLAGS_OFFSET)
+            pos += _ENTRY_FIXED_SIZE
+            if version >= 3 and flags & 0x4000:
+                # Extended flags.
+                pos += 2
+            if stat.S_ISDIR(mode):
+                # Sparse directory entries hide the files below them.
+                raise UnsupportedRepository("Unsupported sparse index.")
+
+            if version == 4:
+                # The path is compressed against the previous one.
+                strip, pos = _read_offset_varint(data, pos)
+                end = data.index(b"\0", pos)
+                path = path[: len(path) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b"\0", pos)
+                path = data[pos:end]
+                # Entries are padded with 1 to 8 NUL bytes to a multiple of 8.
+                pos = entry_start + ((end - entry_start + 8) & ~7)
+            yield path
+
+        while pos < len(data) - _SHA1_SIZE:
+            signature = data[pos : pos + 4]
+            (size,) = struct.unpack_from(">L", data, pos + 4)
+            if not signature[:1].isupper():
+                # Extensions starting with a lowercase letter (like split or sparse
+                # indexes) change the meaning of the entries.
+                raise UnsupportedRepository(
+                    f"Unsupported index extension {signature!r}."
+                )
+            pos += 8 + size
+    except (struct.error, ValueError, IndexError):
+        raise UnsupportedRepository("Truncated index.")
+
+
+def _read_offset_varint(data: bytes, pos: int) -> tuple[int, int]:
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
@@ -7,13 +7,18 @@ Responsible for getting the version and name from a project.
 
 from __future__ import annotations
 
+import ast
 import contextlib
 import importlib.metadata
+import os
 import sys
 
+from functools import cached_property, lru_cache
 from importlib import import_module
+from importlib.machinery import PathFinder
 from importlib.metadata import PackageNotFoundError
 from types import ModuleType
+from typing import NamedTuple
 
 
 def _get_package(package_dir: str, package: str) -> ModuleType:
@@ -37,9 +42,192 @@ def _get_package(package_dir: str, package: str) -> ModuleType:
     return module
 
 
+class _StaticVersion(NamedTuple):
+    version: str
+    # Only Incremental versions know the name of their project.
+    project_name: str | None
+
+
+def _find_package_source(package_dir: str, package: str) -> str | None:
+    """
+    Return the source file that importing *package* would run, without importing
+    anything.
+
+    Like `_get_package`, the package is looked for in `sys.path` before *package_dir*.
+    """
+    if package in sys.modules:
+        # There's nothing to gain, it's already imported.
+        return None
+
+    parts = package.split(".")
+    for search_path in (sys.path, [package_dir]):
+        spec = None
+        path: list[str] | None = search_path
+        for i in range(len(parts)):
+            spec = PathFinder.find_spec(".".join(parts[: i + 1]), path)
+            if spec is None:
+                break
+            path = spec.submodule_search_locations
+        if spec is not None:
+            if spec.origin and spec.origin.endswith(".py"):
+                return spec.origin
+            return None
+
+    return None
+
+
+def _get_static_version(package_dir: str, package: str) -> _StaticVersion | None:
+    """
+    Try to get the `__version__` of the package by parsing its source rather than
+    importing it.
+
+    Only a literal assigned once at the top level of the package, or of its
+    `_version` module when the package imports `__version__` from there, is
+    understood: anything else is left to the import.
+    """
+    source = _find_package_source(package_dir, package)
+    if source is None:
+        return None
+
+    tree = _parse(source)
+    if tree is None:
+        return None
+    binding = _find_version_binding(tree)
+    if binding is not None and _imports_version_module(binding, package):
+        tree = _parse(os.path.join(os.path.dirname(source), "_version.py"))
+        if tree is None:
+            return None
+        binding = _find_version_binding(tree)
+
+    if isinstance(binding, ast.Assign) and any(
+        isinstance(t, ast.Name) and t.id == "__version__" for t in binding.targets
+    ):
+        return _evaluate_version(binding.value, tree)
+    if (
+        isinstance(binding, ast.AnnAssign)
+        and isinstance(binding.target, ast.Name)
+        and binding.value is not None
+    ):
+        return _evaluate_version(binding.value, tree)
+    return None
+
+
+def _parse(path: str) -> ast.Module | None:
+    try:
+        with open(path, "rb") as f:
+            return ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _find_version_binding(tree: ast.Module) -> ast.stmt | None:
+    """
+    Return the top level statement of the module binding `__version__`, if it's
+    the only binding of the name anywhere in the module.
+
+    Any other binding, like an augmented assignment, an import, or an assignment
+    within a `try` or `if` block, may change the value seen when the package is
+    imported.
+    """
+    bindings = [(node, _count_version_bindings(node)) for node in tree.body]
+    bindings = [(node, count) for node, count in bindings if count]
+    if len(bindings) != 1 or bindings[0][1] != 1:
+        return None
+    return bindings[0][0]
+
+
+def _count_version_bindings(statement: ast.stmt) -> int:
+    """
+    Return how many times `__version__` may be bound within *statement*.
+    """
+    count = 0
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Name):
+            count += node.id == "__version__" and not isinstance(node.ctx, ast.Load)
+        elif isinstance(node, ast.alias):
+            # A star import may bind any name.
+            name = node.asname or node.name.split(".")[0]
+            count += name in ("__version__", "*")
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            count += "__version__" in node.names
+        elif isinstance(
+            node,
+            (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.ExceptHandler),
+        ):
+            count += node.name == "__version__"
+    return count
+
+
+def _imports_version_module(statement: ast.stmt, package: str) -> bool:
+    """
+    Return whether *statement* is `from ._version import __version__`.
+    """
+    return (
+        isinstance(statement, ast.ImportFrom)
+        and (statement.module, statement.level)
+        in (("_version", 1), (f"{package}._version", 0))
+        and any(
+            alias.name == "__version__" and alias.asname is None
+            for alias in statement.names
+        )
+    )
+
+
+def _evaluate_version(value: ast.expr, tree: ast.Module) -> _StaticVersion | None:
+    """
+    Evaluate a `__version__` string, tuple or Incremental Version the same way
+    `get_version` and `get_project_name` handle the imported value.
+    """
+    with contextlib.suppress(ValueError, TypeError, SyntaxError):
+        version = ast.literal_eval(value)
+        if isinstance(version, str) and version:
+            return _StaticVersion(version.strip(), None)
+        if isinstance(version, tuple) and version:
+            return _StaticVersion(".".join(map(str, version)).strip(), None)
+        return None
+
+    # Incremental's Version(package, major, minor, micro, release_candidate=None,
+    # post=None, dev=None), when it's imported from incremental.
+    if not (
+        isinstance(value, ast.Call)
+        and isinstance(value.func, ast.Name)
+        and value.func.id == "Version"
+        and any(
+            isinstance(node, ast.ImportFrom)
+            and node.module == "incremental"
+            and any(a.name == "Version" and a.asname is None for a in node.names)
+            for node in tree.body
+        )
+    ):
+        return None
+    try:
+        name, major, minor, micro = map(ast.literal_eval, value.args)
+        options = {k.arg: ast.literal_eval(k.value) for k in value.keywords}
+    except (ValueError, TypeError, SyntaxError):
+        return None
+    if (
+        not isinstance(name, str)
+        or not all(type(part) is int for part in (major, minor, micro))
+        or not set(options) <= {"release_candidate", "post", "dev"}
+        or not all(o is None or type(o) is int for o in options.values())
+    ):
+        return None
+
+    version = f"{major}.{minor}.{micro}"
+    for option, prefix in [("release_candidate", "rc"), ("post", ".post")]:
+        if options.get(option) is not None:
+            version += f"{prefix}{options[option]}"
+    if options.get("dev") is not None:
+        version += f".dev{options['dev']}"
+    return _StaticVersion(version, name)
+
+
+@lru_cache(maxsize=None)
 def _get_metadata_version(package: str) -> str | None:
     """
     Try to get the version from the package metadata.
+
+    Looking up a distribution scans all of `sys.path`, so the result is cached.
     """
     with contextlib.suppress(PackageNotFoundError):
         if version := importlib.metadata.version(package):
@@ -48,54 +236,107 @@ def _get_metadata_version(package: str) -> str | None:
     return None
 
 
-def get_version(package_dir: str, package: str) -> str:
+class ProjectMetadata:
     """
-    Get the version of a package.
+    Resolve the version and the name of the project from its *package*.
 
-    Try to extract the version from the distribution version metadata that matches
-    `package`, then fall back to looking for the package in `package_dir`.
+    Each source is only looked up once and shared between the version and the name:
+    the source of the package is parsed at most once, and it's imported at most once,
+    only if the source can't be understood.
     """
-    version: str | None
 
-    # First try to get the version from the package metadata.
-    if version := _get_metadata_version(package):
-        return version
+    def __init__(self, package_dir: str, package: str):
+        self.package_dir = package_dir
+        self.package = package
+
+    @cached_property
+    def _static_version(self) -> _StaticVersion | None:
+        return _get_static_version(self.package_dir, self.package)
+
+    @cached_property
+    def _module(self) -> ModuleType:
+        return _get_package(self.package_dir, self.package)
+
+    @cached_property
+    def version(self) -> str:
+        """
+        The version of the package.
+
+        Try to extract the version from the distribution version metadata that
+        matches `package`, then fall back to looking for the package in
+        `package_dir`. The package is only imported if its `__version__` can't be
+        read from its source.
+        """
+        version: str | None
+
+        # First try to get the version from the package metadata.
+        if version := _get_metadata_version(self.package):
+            return version
+
+        # Then from the source, which doesn't run the code of the package.
+        if self._static_version:
+            return self._static_version.version
+
+        # When no version if found, fall back to looking for the package in
+        # `package_dir`.
+        version = getattr(self._module, "__version__", None)
+        if not version:
+            raise Exception(
+                "No __version__ or metadata version info for the "
+                f"'{self.package}' package."
+            )
+
+        if isinstance(version, str):
+            return version.strip()
+
+        if isinstance(version, tuple):
+            return ".".join(map(str, version)).strip()
+
+        # Try duck-typing as an Incremental version.
+        if hasattr(version, "base"):
+            try:
+                version = str(version.base()).strip()
+                # Incremental uses `X.Y.rcN`.
+                # Standardize on importlib (and PEP440) use of `X.YrcN`:
+                return version.replace(".rc", "rc")  # type: ignore
+            except TypeError:
+                pass
 
-    # When no version if found, fall back to looking for the package in `package_dir`.
-    module = _get_package(package_dir, package)
-    version = getattr(module, "__version__", None)
-    if not version:
         raise Exception(
-            f"No __version__ or metadata version info for the '{package}' package."
+            "Version must be a string, tuple, or an Incremental Version."
+            " If you can't provide that, use the --version argument and specify one."
         )
 
-    if isinstance(version, str):
-        return version.strip()
+    @cached_property
+    def name(self) -> str:
+        """
+        The name of the project: the one of its Incremental version if it has one,
+        otherwise the name of the package.
+        """
+        if self._static_version:
+            return self._static_version.project_name or self.package.title()
 
-    if isinstance(version, tuple):
-        return ".".join(map(str, version)).strip()
+        version = getattr(self._module, "__version__", None)
+        # Incremental has support for package names, try duck-typing it.
+        with contextlib.suppress(AttributeError):
+            return str(version.package)  # type: ignore
 
-    # Try duck-typing as an Incremental version.
-    if hasattr(version, "base"):
-        try:
-            version = str(version.base()).strip()
-            # Incremental uses `X.Y.rcN`.
-            # Standardize on importlib (and PEP440) use of `X.YrcN`:
-            return version.replace(".rc", "rc")  # type: ignore
-        except TypeError:
-            pass
-
-    raise Exception(
-        "Version must be a string, tuple, or an Incremental Version."
-        " If you can't provide that, use the --version argument and specify one."
-    )
+        return self.package.title()
+
+
+def get_version(package_dir: str, package: str) -> str:
+    """
+    Get the version of a package.
+
+    See `ProjectMetadata.version`.
+    """
+    return ProjectMetadata(package_dir, package).version
 
 
 def get_project_name(package_dir: str, package: str) -> str:
-    module = _get_package(package_dir, package)
-    version = getattr(module, "__version__", None)
-    # Incremental has support for package names, try duck-typing it.
-    with contextlib.suppress(AttributeError):
-        return str(version.package)  # type: ignore
+    """
+    Get the name of the project of a package.
 
-    return package.title()
+    See `ProjectMetadata.name`.
+    """
+    return ProjectMetadata(package_dir, package).name
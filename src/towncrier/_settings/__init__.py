@@ -8,6 +8,7 @@ from towncrier._settings import load
 load_config = load.load_config
 ConfigError = load.ConfigError
 load_config_from_options = load.load_config_from_options
+clear_config_cache = load.clear_config_cache
 
 # Help message for --config CLI option, shared by all sub-commands.
 config_option_help = (
@@ -21,4 +22,5 @@ __all__ = [
     "load_config",
     "ConfigError",
     "load_config_from_options",
+    "clear_config_cache",
 ]
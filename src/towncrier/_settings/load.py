@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import atexit
+import copy
 import dataclasses
 import os
 import re
@@ -50,12 +51,16 @@ class Config:
     issue_format: str | None = None
     underlines: Sequence[str] = ("=", "-", "~")
     wrap: bool = False
+    wrap_width: int = 79
     all_bullets: bool = True
     orphan_prefix: str = "+"
     create_eof_newline: bool = True
     create_add_extension: bool = True
     ignore: list[str] | None = None
     issue_pattern: str = ""
+    jobs: int = 1
+    cache_dir: str | None = None
+    cache_size: int = 10000
 
 
 class ConfigError(ClickException):
@@ -65,18 +70,19 @@ class ConfigError(ClickException):
 
 
 def load_config_from_options(
-    directory: str | None, config_path: str | None
+    directory: str | None, config_path: str | None, cache: bool = False
 ) -> tuple[str, Config]:
     """
     Load the configuration from a given directory or specific configuration file.
 
     Unless an explicit configuration file is given, traverse back from the given
-    directory looking for a configuration file.
+    directory looking for a configuration file. If *cache* is true, the result of
+    the traversal is memoized, see `traverse_for_config`.
 
     Returns a tuple of the base directory and the parsed Config instance.
     """
     if config_path is None:
-        return traverse_for_config(directory)
+        return traverse_for_config(directory, cache=cache)
 
     config_path = os.path.abspath(config_path)
 
@@ -94,16 +100,47 @@ def load_config_from_options(
     return base_directory, config
 
 
-def traverse_for_config(path: str | None) -> tuple[str, Config]:
+# The configurations found by `traverse_for_config`, keyed by the directory the
+# search started from, along with the file they were loaded from and its status.
+_config_cache: dict[str, tuple[str, str, tuple[int, int] | None, Config]] = {}
+
+
+def clear_config_cache() -> None:
+    """
+    Forget the configurations memoized by `traverse_for_config`.
+    """
+    _config_cache.clear()
+
+
+def traverse_for_config(path: str | None, cache: bool = False) -> tuple[str, Config]:
     """
     Search for a configuration file in the current directory and all parent directories.
 
+    If *cache* is true, the result is memoized for the rest of the process, for tools
+    calling towncrier repeatedly. The configuration is loaded again if its file
+    changes, but a configuration file added closer to *path* is only noticed after
+    `clear_config_cache` is called.
+
     Returns the directory containing the configuration file and the parsed configuration.
     """
     start_directory = directory = os.path.abspath(path or os.getcwd())
+    cached = _config_cache.get(start_directory) if cache else None
+    if cached is not None and _file_signature(cached[1]) == cached[2]:
+        # Deep copies, so callers can't change the nested values of the cached one.
+        return cached[0], copy.deepcopy(cached[3])
+
     while True:
-        config = load_config(directory)
-        if config is not None:
+        config_file = _find_config_file(directory)
+        if config_file is not None:
+            signature = _file_signature(config_file)
+            config = load_config_from_file(directory, config_file)
+            if cache:
+                _config_cache[start_directory] = (
+                    directory,
+                    config_file,
+                    signature,
+                    copy.deepcopy(config),
+                )
             return directory, config
 
         parent = os.path.dirname(directory)
@@ -114,23 +151,42 @@ def traverse_for_config(path: str | None) -> tuple[str, Config]:
         directory = parent
 
 
-def load_config(directory: str) -> Config | None:
+def _file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _find_config_file(directory: str) -> str | None:
     towncrier_toml = os.path.join(directory, "towncrier.toml")
     pyproject_toml = os.path.join(directory, "pyproject.toml")
 
     if os.path.exists(towncrier_toml):
-        config_file = towncrier_toml
+        return towncrier_toml
     elif os.path.exists(pyproject_toml):
-        config_file = pyproject_toml
+        return pyproject_toml
     else:
         return None
 
+
+def load_config(directory: str) -> Config | None:
+    config_file = _find_config_file(directory)
+    if config_file is None:
+        return None
+
     return load_config_from_file(directory, config_file)
 
 
 def load_config_from_file(directory: str, config_file: str) -> Config:
     with open(config_file, "rb") as conffile:
-        config = tomllib.load(conffile)
+        content = conffile.read()
+
+    # Most pyproject.toml files have nothing to do with towncrier: skip parsing them.
+    if b"towncrier" not in content:
+        raise ConfigError("No [tool.towncrier] section.", failing_option="all")
+    config = tomllib.loads(content.decode())
 
     return parse_toml(directory, config)
 
@@ -170,6 +226,13 @@ def parse_toml(base_path: str, config: Mapping[str, Any]) -> Config:
                         f"`{field.name}` option must be boolean: false or true.",
                         failing_option=field.name,
                     )
+            if field.type in ("int", int):
+                value = config[field.name]
+                if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                    raise ConfigError(
+                        f"`{field.name}` option must be a positive integer.",
+                        failing_option=field.name,
+                    )
             parsed_data[field.name] = config[field.name]
 
     # Process 'section'.
@@ -11,14 +11,61 @@ from __future__ import annotations
 
 import click
 
-from .build import _main as _build_cmd
-from .check import _main as _check_cmd
 from .click_default_group import DefaultGroup
-from .create import _main as _create_cmd
 
 
-@click.group(cls=DefaultGroup, default="build", default_if_no_args=True)
+# The commands are only imported when used, so that running one of them doesn't pay
+# for importing the dependencies of the others.
+_commands = {
+    "build": "towncrier.build:_main",
+    "check": "towncrier.check:_main",
+    "create": "towncrier.create:_main",
+}
+
+
+def _start_profile(
+    ctx: click.Context, param: click.Parameter, path: str | None
+) -> None:
+    """
+    Profile everything that runs until *ctx* is closed, then write the stats to
+    *path*.
+
+    This is called while the options of the group are parsed, so importing and
+    running the command are both profiled.
+    """
+    if not path or ctx.resilient_parsing:
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+
+    def stop() -> None:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+    ctx.call_on_close(stop)
+    profiler.enable()
+
+
+@click.group(
+    cls=DefaultGroup,
+    default="build",
+    default_if_no_args=True,
+    lazy_commands=_commands,
+)
 @click.version_option()
+@click.option(
+    "--profile-output",
+    default=None,
+    metavar="FILE_PATH",
+    expose_value=False,
+    callback=_start_profile,
+    help=(
+        "Profile the command with cProfile and write the stats to FILE_PATH, "
+        "to be read with pstats or a viewer like snakeviz."
+    ),
+)
 def cli() -> None:
     """
     Towncrier is a utility to produce useful, summarised news files for your project.
@@ -37,8 +84,3 @@ def cli() -> None:
     which is valuable to those who may wish to use the software.
     """
     pass
-
-
-cli.add_command(_build_cmd)
-cli.add_command(_check_cmd)
-cli.add_command(_create_cmd)
@@ -0,0 +1,121 @@
+"""
+Responsible for measuring where the time of a command is spent.
+
+Nothing is recorded unless a command runs within `record`: the `phase` and `count`
+helpers used throughout towncrier do nothing otherwise.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+
+from typing import Any, ContextManager, Iterator, NamedTuple
+
+
+class PhaseTiming(NamedTuple):
+    name: str
+    # In seconds.
+    wall: float
+    cpu: float
+
+
+class Timings:
+    """
+    The wall and CPU time of each phase of a command, and counters of the work it
+    did, like the number of files scanned.
+    """
+
+    def __init__(self) -> None:
+        self.phases: list[PhaseTiming] = []
+        self.counters: dict[str, int] = {}
+        self.total = PhaseTiming("total", 0.0, 0.0)
+        # Counters may be updated by the threads reading news fragments.
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the code run within this context as the phase *name*.
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                PhaseTiming(name, time.perf_counter() - wall, time.process_time() - cpu)
+            )
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Add *amount* to the counter *name*.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> str:
+        """
+        Return a human readable summary of the timings and counters.
+        """
+        width = max(len(phase.name) for phase in [*self.phases, self.total])
+        lines = ["Timings:"]
+        for phase in [*self.phases, self.total]:
+            lines.append(
+                f"  {phase.name:<{width}}  {phase.wall:8.3f}s wall  "
+                f"{phase.cpu:8.3f}s CPU"
+            )
+        if self.counters:
+            width = max(map(len, self.counters))
+            lines.append("Counters:")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:<{width}}  {value}")
+        return "\n".join(lines)
+
+    def as_data(self) -> dict[str, Any]:
+        """
+        Return the timings and counters as plain data, to be dumped as JSON.
+        """
+        return {
+            "phases": [phase._asdict() for phase in self.phases],
+            "total": self.total._asdict(),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+_current: Timings | None = None
+
+
+@contextlib.contextmanager
+def record() -> Iterator[Timings]:
+    """
+    Record the phases and counters of the code run within this context.
+    """
+    global _current
+    previous, _current = _current, Timings()
+    timings = _current
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield timings
+    finally:
+        timings.total = PhaseTiming(
+            "total", time.perf_counter() - wall, time.process_time() - cpu
+        )
+        _current = previous
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Time the code run within this context as the phase *name*, if recording.
+    """
+    if _current is None:
+        return contextlib.nullcontext()
+    return _current.phase(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add *amount* to the counter *name*, if recording.
+    """
+    if _current is not None:
+        _current.count(name, amount)
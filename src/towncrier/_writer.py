@@ -8,10 +8,16 @@ affecting existing content.
 
 from __future__ import annotations
 
+import os
+import re
+import shutil
+import string
 import sys
+import tempfile
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, NamedTuple, TextIO
 
 
 if sys.version_info < (3, 10):
@@ -26,6 +32,11 @@ else:
         path.write_text(content, **kwargs)
 
 
+# Existing news files are processed in chunks of this many characters, so they
+# never need to be loaded into memory as a whole.
+_CHUNK_SIZE = 1024 * 1024
+
+
 def append_to_newsfile(
     directory: str,
     filename: str,
@@ -33,58 +44,248 @@ def append_to_newsfile(
     top_line: str,
     content: str,
     single_file: bool,
+    title_format: str | None = None,
 ) -> None:
     """
     Write *content* to *directory*/*filename* behind *start_string*.
 
-    Double-check *top_line* (i.e. the release header) is not already in the
-    file.
+    Double-check *top_line* (i.e. the release header) is not already a release
+    title in the file. Titles are found using *title_format* if given, otherwise
+    *top_line* must match a whole line.
 
     if *single_file* is True, add it to an existing file, otherwise create a
     fresh one.
     """
     news_file = Path(directory) / filename
 
-    header, prev_body = _figure_out_existing_content(
-        news_file, start_string, single_file
-    )
+    if not single_file or not news_file.exists():
+        # Per-release news files always start empty.
+        # Non-existent files have no existing content.
+        # We don't want extra whitespace at the end of this new file.
+        _newline_write_text(
+            news_file,
+            content.rstrip() + "\n",
+            encoding="utf-8",
+            newline="",
+        )
+        return
 
-    if top_line and top_line in prev_body:
-        raise ValueError("It seems you've already produced newsfiles for this version?")
+    start = _find_in_file(news_file, start_string) if start_string else None
+    body_start = 0 if start is None else start + len(start_string)
 
-    _newline_write_text(
+    if top_line and _has_release(
         news_file,
-        # If there is no previous body that means we're writing a brand new news file.
-        # We don't want extra whitespace at the end of this new file.
-        header + (content + prev_body if prev_body else content.rstrip() + "\n"),
-        encoding="utf-8",
-        # Leave newlines alone. This probably leads to inconsistent newlines,
-        # because we've loaded existing content with universal newlines, but that's
-        # the original behavior.
-        newline="",
+        top_line.strip(),
+        title_format or _literal_format(top_line),
+        body_start,
+    ):
+        raise ValueError("It seems you've already produced newsfiles for this version?")
+
+    # Leave newlines alone when writing. This probably leads to inconsistent
+    # newlines, because we read existing content with universal newlines, but that's
+    # the original behavior.
+    # The news file is closed before it's replaced, which Windows requires.
+    with _replace_file(news_file) as new:
+        with news_file.open(encoding="utf-8") as old:
+            if start is not None:
+                # Everything before *start_string* is kept as the header.
+                _copy_stripped_header(old, new, start)
+                new.write(f"\n\n{start_string}\n")
+                _skip(old, len(start_string))
+
+            prev_body = _skip_whitespace(old)
+            if prev_body:
+                new.write(content)
+                new.write(prev_body)
+                shutil.copyfileobj(old, new, _CHUNK_SIZE)
+            else:
+                new.write(content.rstrip() + "\n")
+
+
+class Release(NamedTuple):
+    """
+    A release title found in a news file.
+
+    The fields not used by the title format are None.
+    """
+
+    title: str
+    name: str | None
+    version: str | None
+    project_date: str | None
+
+
+def find_releases(news_file: Path, title_format: str, start: int = 0) -> list[Release]:
+    """
+    Find the release titles rendered from *title_format* in *news_file*.
+
+    Only whole lines after the *start* offset are considered, and the file is
+    searched in chunks of whole lines.
+    """
+    pattern = _whole_line(_title_regex(title_format))
+    releases = []
+    for chunk in _iter_line_chunks(news_file, start):
+        for match in pattern.finditer(chunk):
+            releases.append(
+                Release(
+                    match.group(1),
+                    match.groupdict().get("name"),
+                    match.groupdict().get("version"),
+                    match.groupdict().get("project_date"),
+                )
+            )
+    return releases
+
+
+def _has_release(news_file: Path, title: str, title_format: str, start: int) -> bool:
+    """
+    Return whether *title* is one of the release titles that `find_releases` finds
+    in *news_file*.
+
+    The file is only searched for *title* itself, which is much faster than finding
+    all the releases.
+    """
+    if not re.fullmatch(_title_regex(title_format), title):
+        # Whatever is in the file, it's not a release title.
+        return False
+    pattern = _whole_line(re.escape(title))
+    return any(
+        title in chunk and pattern.search(chunk)
+        for chunk in _iter_line_chunks(news_file, start)
     )
 
 
-def _figure_out_existing_content(
-    news_file: Path, start_string: str, single_file: bool
-) -> tuple[str, str]:
+def _title_regex(title_format: str) -> str:
+    """
+    Return a regular expression matching the titles rendered from *title_format*.
     """
-    Try to read *news_file* and split it into header (everything before
-    *start_string*) and the old body (everything after *start_string*).
+    parts = []
+    groups = set()
+    for literal, field, _, _ in string.Formatter().parse(title_format.strip()):
+        parts.append(re.escape(literal))
+        if field is None:
+            continue
+        if field in Release._fields[1:] and field not in groups:
+            # Capture the first occurrence of the fields we know about.
+            groups.add(field)
+            parts.append(f"(?P<{field}>.*?)")
+        else:
+            parts.append(".*?")
+    return "".join(parts)
 
-    If there's no *start_string*, return empty header.
 
-    Empty file and per-release files have neither.
+def _whole_line(regex: str) -> re.Pattern[str]:
     """
-    if not single_file or not news_file.exists():
-        # Per-release news files always start empty.
-        # Non-existent files have no existing content.
-        return "", ""
+    Compile *regex* to match whole lines of a multiline text, ignoring the
+    whitespace around them like `str.strip`. The first group is the match of
+    *regex*.
+    """
+    return re.compile(rf"^[^\S\n]*({regex})[^\S\n]*$", re.MULTILINE)
+
+
+def _iter_line_chunks(path: Path, start: int = 0) -> Iterator[str]:
+    """
+    Yield the text of *path* after the *start* offset, in chunks that only contain
+    whole lines.
+    """
+    with path.open(encoding="utf-8") as f:
+        _skip(f, start)
+        pending = ""
+        while chunk := f.read(_CHUNK_SIZE):
+            text = pending + chunk
+            end = text.rfind("\n") + 1
+            # Keep the incomplete last line for the next chunk.
+            pending = text[end:]
+            if end:
+                yield text[:end]
+        if pending:
+            yield pending
+
+
+def _literal_format(text: str) -> str:
+    """
+    Escape *text* to be used as a format string that renders as itself.
+    """
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _find_in_file(path: Path, needle: str, start: int = 0) -> int | None:
+    """
+    Return the offset of the first *needle* found in the text of *path* at or after
+    the *start* offset, or None if there's none.
+    """
+    with path.open(encoding="utf-8") as f:
+        _skip(f, start)
+        offset = start
+        # Keep the end of the previous chunk, in case *needle* straddles chunks.
+        tail = ""
+        while chunk := f.read(_CHUNK_SIZE):
+            text = tail + chunk
+            index = text.find(needle)
+            if index != -1:
+                return offset - len(tail) + index
+            tail = text[-(len(needle) - 1) :] if len(needle) > 1 else ""
+            offset += len(chunk)
+    return None
 
-    content = Path(news_file).read_text(encoding="utf-8")
 
-    t = content.split(start_string, 1)
-    if len(t) == 2:
-        return f"{t[0].rstrip()}\n\n{start_string}\n", t[1].lstrip()
+def _skip(f: TextIO, length: int) -> None:
+    """
+    Skip the next *length* characters of *f*.
+    """
+    while length > 0 and (chunk := f.read(min(length, _CHUNK_SIZE))):
+        length -= len(chunk)
+
+
+def _copy_stripped_header(old: TextIO, new: TextIO, length: int) -> None:
+    """
+    Copy the next *length* characters of *old* to *new*, without trailing
+    whitespace.
+    """
+    # Whitespace is held back until it's followed by something else.
+    pending = ""
+    while length > 0:
+        chunk = old.read(min(length, _CHUNK_SIZE))
+        if not chunk:
+            break
+        length -= len(chunk)
+        stripped = chunk.rstrip()
+        if stripped:
+            new.write(pending + stripped)
+            pending = chunk[len(stripped) :]
+        else:
+            pending += chunk
 
-    return "", content.lstrip()
+
+def _skip_whitespace(old: TextIO) -> str:
+    """
+    Skip the whitespace at the current position of *old* and return the chunk of
+    text that follows it, or an empty string if there is nothing else.
+    """
+    while chunk := old.read(_CHUNK_SIZE):
+        chunk = chunk.lstrip()
+        if chunk:
+            return chunk
+    return ""
+
+
+@contextmanager
+def _replace_file(path: Path) -> Iterator[TextIO]:
+    """
+    Open a temporary file that atomically replaces *path* once it's written.
+
+    The file mode of *path* is kept, and if it's a symbolic link, its target is
+    replaced.
+    """
+    path = path.resolve()
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with open(fd, "w", encoding="utf-8", newline="") as f:
+            yield f
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
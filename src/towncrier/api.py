@@ -0,0 +1,345 @@
+"""
+Build news files from Python, without the side effects of the command line.
+
+Nothing is printed, prompted, written or removed: the configuration, the template
+and the news fragments are loaded and rendered on demand, so they can be reused
+across many calls.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Any, Mapping, NamedTuple, Sequence
+
+from . import _timings
+from ._builder import (
+    FragmentFile,
+    IssueMemo,
+    PreparedSection,
+    discover_fragments,
+    find_fragment_files,
+    fragments_as_data,
+    prepare_section,
+    prepare_sections,
+    read_fragments,
+    render_sections,
+    split_fragments,
+)
+from ._cache import FragmentCache, SectionCache
+from ._settings.load import (
+    Config,
+    ConfigError,
+    clear_config_cache,
+    load_config_from_options,
+)
+
+
+if sys.version_info < (3, 10):
+    import importlib_resources as resources
+else:
+    from importlib import resources
+
+
+__all__ = [
+    "Config",
+    "ConfigError",
+    "FragmentCache",
+    "FragmentSet",
+    "PreparedFragments",
+    "SectionCache",
+    "TemplateSource",
+    "as_data",
+    "clear_config_cache",
+    "collect",
+    "get_top_line",
+    "load_config",
+    "load_template",
+    "prepare",
+    "render",
+    "render_prepared",
+]
+
+
+class TemplateSource(NamedTuple):
+    """
+    The source of a template, and whether it renders Markdown.
+    """
+
+    source: str
+    is_markdown: bool
+
+
+class FragmentSet(NamedTuple):
+    """
+    The news fragments of a project, as collected by `collect`.
+    """
+
+    base_directory: str
+    # The content of the news fragments of each section, keyed by issue, category
+    # and counter.
+    contents: Mapping[str, Mapping[tuple[str, str, int], str]]
+    files: Sequence[FragmentFile]
+    # The fragments grouped by section, category and text, see `split_fragments`.
+    fragments: Mapping[str, Mapping[str, Mapping[str, Sequence[str]]]]
+    issue_memo: IssueMemo
+
+
+class PreparedFragments(NamedTuple):
+    """
+    The news fragments of a project, as prepared for the template by `prepare`.
+    """
+
+    base_directory: str
+    files: Sequence[FragmentFile]
+    sections: Mapping[str, PreparedSection]
+
+
+def load_config(
+    directory: str | None = None, config_path: str | None = None, cache: bool = False
+) -> tuple[str, Config]:
+    """
+    Load the configuration of a project, like the `--dir` and `--config` options
+    of the command line do.
+
+    Without *config_path*, the configuration file is looked for in *directory*, or
+    the current directory, and its parents. Return the base directory of the project
+    and its configuration, or raise `ConfigError`.
+
+    If *cache* is true, the configuration found from a directory is memoized for the
+    rest of the process, until its file changes or `clear_config_cache` is called.
+    """
+    return load_config_from_options(directory, config_path, cache=cache)
+
+
+def load_template(config: Config) -> TemplateSource:
+    """
+    Read the template of the configuration.
+    """
+    if isinstance(config.template, tuple):
+        source = (
+            resources.files(config.template[0])
+            .joinpath(config.template[1])
+            .read_text(encoding="utf-8")
+        )
+        extension = os.path.splitext(config.template[1])[1]
+    else:
+        source = Path(config.template).read_text(encoding="utf-8")
+        extension = os.path.splitext(config.template)[1]
+    return TemplateSource(source, extension.lower() == ".md")
+
+
+def collect(
+    base_directory: str,
+    config: Config,
+    strict: bool | None = None,
+    jobs: int | None = None,
+    cache: FragmentCache | None = None,
+) -> FragmentSet:
+    """
+    Find, read and group the news fragments of the project in *base_directory*.
+
+    Unless *strict* is given, invalid fragment names only fail when the `ignore`
+    option is set, like `towncrier build` does.
+    """
+    if strict is None:
+        strict = config.ignore is not None
+    contents, files = find_fragment_files(
+        base_directory, config, strict, jobs=jobs, cache=cache
+    )
+    issue_memo = IssueMemo(config.issue_format)
+    fragments = split_fragments(
+        contents,
+        config.types,
+        all_bullets=config.all_bullets,
+        issue_memo=issue_memo,
+    )
+    return FragmentSet(base_directory, contents, files, fragments, issue_memo)
+
+
+def prepare(
+    base_directory: str,
+    config: Config,
+    strict: bool | None = None,
+    jobs: int | None = None,
+    cache: FragmentCache | None = None,
+    section_cache: SectionCache | None = None,
+) -> PreparedFragments:
+    """
+    Find the news fragments of the project in *base_directory* and prepare each
+    section for the template, see `collect`.
+
+    With a *section_cache*, the sections whose news fragments have the same paths,
+    modification times and sizes as when they were cached are reused, without
+    reading their news fragments again.
+    """
+    if strict is None:
+        strict = config.ignore is not None
+    files = discover_fragments(base_directory, config, strict)
+    files_by_section: dict[str, list[FragmentFile]] = defaultdict(list)
+    for fragment in files:
+        files_by_section[fragment.section].append(fragment)
+
+    sections = {}
+    # The sections to prepare again, with the key to cache them.
+    stale: dict[str, tuple[list[FragmentFile], str | None]] = {}
+    for name in config.sections:
+        section_files = files_by_section[name]
+        key = None
+        if section_cache is not None:
+            key = section_cache.key([fragment.path for fragment in section_files])
+            cached = section_cache.get(name, key)
+            if cached is not None:
+                _timings.count("sections from cache")
+                sections[name] = cached
+                continue
+        stale[name] = (section_files, key)
+
+    if jobs is None:
+        jobs = config.jobs
+    if stale:
+        stale_files = [fragment for files, _ in stale.values() for fragment in files]
+        contents = read_fragments(
+            [fragment.path for fragment in stale_files], jobs=jobs, cache=cache
+        )
+        fragments: dict[str, dict[tuple[str, str, int], str]] = {
+            name: {} for name in stale
+        }
+        for fragment, content in zip(stale_files, contents):
+            fragments[fragment.section][
+                fragment.issue, fragment.category, fragment.counter
+            ] = content
+        prepared = prepare_sections(
+            fragments, config.types, config.all_bullets, config.issue_format, jobs=jobs
+        )
+        for name, section in prepared.items():
+            sections[name] = section
+            if section_cache is not None:
+                section_cache.put(name, stale[name][1], section)
+
+    # In the order of the configuration, whichever sections were cached.
+    sections = {name: sections[name] for name in config.sections}
+    return PreparedFragments(base_directory, files, sections)
+
+
+def get_top_line(config: Config, name: str, version: str, project_date: str) -> str:
+    """
+    Return the title of the release, or an empty string if it's rendered by the
+    template or disabled.
+    """
+    if not config.title_format:
+        return ""
+    return config.title_format.format(
+        name=name, version=version, project_date=project_date
+    )
+
+
+def render(
+    fragment_set: FragmentSet,
+    config: Config,
+    version: str,
+    name: str = "",
+    project_date: str | None = None,
+    template: TemplateSource | None = None,
+    bytecode_cache_dir: str | None = None,
+) -> str:
+    """
+    Render the release notes of *fragment_set*, including their title.
+
+    The *template* defaults to the one of the configuration; load it once with
+    `load_template` to reuse it. Templates are only compiled once per process.
+    """
+    sections = {
+        section_name: prepare_section(
+            section, fragment_set.issue_memo, config.all_bullets
+        )
+        for section_name, section in fragment_set.fragments.items()
+    }
+    return _render(
+        sections, config, version, name, project_date, template, bytecode_cache_dir
+    )
+
+
+def render_prepared(
+    prepared: PreparedFragments,
+    config: Config,
+    version: str,
+    name: str = "",
+    project_date: str | None = None,
+    template: TemplateSource | None = None,
+    bytecode_cache_dir: str | None = None,
+) -> str:
+    """
+    Render the release notes of the news fragments returned by `prepare`, see
+    `render`.
+    """
+    return _render(
+        prepared.sections,
+        config,
+        version,
+        name,
+        project_date,
+        template,
+        bytecode_cache_dir,
+    )
+
+
+def _render(
+    sections: Mapping[str, PreparedSection],
+    config: Config,
+    version: str,
+    name: str,
+    project_date: str | None,
+    template: TemplateSource | None,
+    bytecode_cache_dir: str | None,
+) -> str:
+    if template is None:
+        template = load_template(config)
+    if project_date is None:
+        project_date = date.today().isoformat()
+
+    rendered = render_sections(
+        # The 0th underline is used for the top line
+        template.source,
+        sections,
+        config.types,
+        config.underlines[1:],
+        config.wrap,
+        {"name": name, "version": version, "date": project_date},
+        top_underline=config.underlines[0],
+        all_bullets=config.all_bullets,
+        # Render the title in the template if the title format is set to "". It can
+        # alternatively be set to False or a string, in either case it shouldn't be
+        # rendered in the template.
+        render_title=config.title_format == "",
+        bytecode_cache_dir=bytecode_cache_dir,
+        wrap_width=config.wrap_width,
+    )
+
+    top_line = get_top_line(config, name, version, project_date)
+    if not top_line:
+        return rendered
+    if template.is_markdown:
+        parts = [top_line]
+    else:
+        parts = [top_line, config.underlines[0] * len(top_line)]
+    parts.append(rendered)
+    return "\n".join(parts)
+
+
+def as_data(fragment_set: FragmentSet, config: Config) -> list[dict[str, Any]]:
+    """
+    Return the sections of *fragment_set* as plain data, see `fragments_as_data`.
+    """
+    return fragments_as_data(
+        fragment_set.fragments,
+        config.types,
+        fragment_set.files,
+        fragment_set.contents,
+        all_bullets=config.all_bullets,
+        issue_memo=fragment_set.issue_memo,
+    )
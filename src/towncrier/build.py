@@ -7,28 +7,33 @@ Build a combined news file from news fragments.
 
 from __future__ import annotations
 
+import json
 import os
 import sys
 
+from contextlib import ExitStack
 from datetime import date
-from pathlib import Path
 
 import click
 
 from click import Context, Option, UsageError
 
-from towncrier import _git
+from towncrier import _git, _timings
 
-from ._builder import find_fragments, render_fragments, split_fragments
-from ._project import get_project_name, get_version
+from ._cache import get_fragment_cache, get_section_cache, get_template_cache_dir
+from ._project import ProjectMetadata
 from ._settings import ConfigError, config_option_help, load_config_from_options
 from ._writer import append_to_newsfile
-
-
-if sys.version_info < (3, 10):
-    import importlib_resources as resources
-else:
-    from importlib import resources
+from .api import (
+    FragmentSet,
+    PreparedFragments,
+    as_data,
+    collect,
+    get_top_line,
+    load_template,
+    prepare,
+    render_prepared,
+)
 
 
 def _get_date() -> str:
@@ -106,6 +111,50 @@ def _validate_answer(ctx: Context, param: Option, value: bool) -> bool:
     help="Do not ask for confirmations. But keep news fragments.",
     callback=_validate_answer,
 )
+@click.option(
+    "--jobs",
+    "jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    metavar="N",
+    help=(
+        "Read news fragments using N threads, and prepare large sections using up "
+        "to N processes. Default to the 'jobs' option."
+    ),
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="text",
+    type=click.Choice(["text", "json"]),
+    help=(
+        "With --draft, the format of the output: the rendered news file, or the news "
+        "fragments as JSON. Default to text."
+    ),
+)
+@click.option(
+    "--timings",
+    "timings_output",
+    default=None,
+    envvar="TOWNCRIER_PROFILE",
+    metavar="FILE_PATH",
+    help=(
+        "Record the wall and CPU time of each phase of the build, and count the "
+        "files scanned, the bytes read and the subprocesses run. Print a summary "
+        "to standard error with '-', or write it as JSON to FILE_PATH. "
+        "Default to the TOWNCRIER_PROFILE environment variable."
+    ),
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    default=False,
+    flag_value=True,
+    help=(
+        "Don't use the 'cache_dir' option: read all the news fragments "
+        "and compile the template again."
+    ),
+)
 def _main(
     draft: bool,
     directory: str | None,
@@ -115,24 +164,54 @@ def _main(
     project_date: str | None,
     answer_yes: bool,
     answer_keep: bool,
+    jobs: int | None,
+    output_format: str,
+    no_cache: bool,
+    timings_output: str | None,
 ) -> None:
     """
     Build a combined news file from news fragment.
     """
+    if output_format != "text" and not draft:
+        raise UsageError("'--format' can only be used with '--draft'.")
+    timings = None
     try:
-        return __main(
-            draft,
-            directory,
-            config_file,
-            project_name,
-            project_version,
-            project_date,
-            answer_yes,
-            answer_keep,
-        )
+        with ExitStack() as stack:
+            if timings_output:
+                timings = stack.enter_context(_timings.record())
+            return __main(
+                draft,
+                directory,
+                config_file,
+                project_name,
+                project_version,
+                project_date,
+                answer_yes,
+                answer_keep,
+                jobs,
+                no_cache,
+                output_format,
+            )
     except ConfigError as e:
         print(e, file=sys.stderr)
         sys.exit(1)
+    finally:
+        # Also reported when the build fails.
+        if timings is not None and timings_output:
+            _write_timings(timings, timings_output)
+
+
+def _write_timings(timings: _timings.Timings, output: str) -> None:
+    """
+    Print a summary of the *timings* to standard error if *output* is "-", otherwise
+    write them as JSON to the *output* path.
+    """
+    if output == "-":
+        click.echo(timings.summary(), err=True)
+        return
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(timings.as_data(), f, indent=2)
+        f.write("\n")
 
 
 def __main(
@@ -144,12 +223,21 @@ def __main(
     project_date: str | None,
     answer_yes: bool,
     answer_keep: bool,
+    jobs: int | None = None,
+    no_cache: bool = False,
+    output_format: str = "text",
 ) -> None:
     """
     The main entry point.
     """
-    base_directory, config = load_config_from_options(directory, config_file)
+    with _timings.phase("config"):
+        base_directory, config = load_config_from_options(directory, config_file)
     to_err = draft
+    # Shared by the version and the name, so the package is only looked up once.
+    project = ProjectMetadata(
+        os.path.abspath(os.path.join(base_directory, config.package_dir)),
+        config.package,
+    )
 
     if project_version is None:
         project_version = config.version
@@ -159,48 +247,52 @@ def __main(
                 "'--version' is required since the config file does "
                 "not contain 'version' or 'package'."
             )
-        project_version = get_version(
-            os.path.join(base_directory, config.package_dir), config.package
-        ).strip()
-
-    click.echo("Loading template...", err=to_err)
-    if isinstance(config.template, tuple):
-        template = (
-            resources.files(config.template[0])
-            .joinpath(config.template[1])
-            .read_text(encoding="utf-8")
-        )
-        template_extension = os.path.splitext(config.template[1])[1]
-    else:
-        template = Path(config.template).read_text(encoding="utf-8")
-        template_extension = os.path.splitext(config.template)[1]
-    is_markdown = template_extension.lower() == ".md"
+        with _timings.phase("version"):
+            project_version = project.version.strip()
+
+    if output_format == "text":
+        click.echo("Loading template...", err=to_err)
+        with _timings.phase("template"):
+            template = load_template(config)
 
     click.echo("Finding news fragments...", err=to_err)
 
-    fragment_contents, fragment_files = find_fragments(
-        base_directory,
-        config,
+    with _timings.phase("fragments"):
+        cache = None if no_cache else get_fragment_cache(base_directory, config)
         # Fail if any fragment filenames are invalid only if ignore list is set
         # (this maintains backward compatibility):
-        strict=(config.ignore is not None),
-    )
-    fragment_filenames = [filename for (filename, _category) in fragment_files]
-
-    click.echo("Rendering news fragments...", err=to_err)
-    fragments = split_fragments(
-        fragment_contents, config.types, all_bullets=config.all_bullets
-    )
+        strict = config.ignore is not None
+        fragment_set: FragmentSet | PreparedFragments
+        if output_format == "json":
+            fragment_set = collect(
+                base_directory, config, strict=strict, jobs=jobs, cache=cache
+            )
+        else:
+            # Only the sections whose news fragments changed since the last build
+            # are read and prepared again.
+            section_cache = (
+                None if no_cache else get_section_cache(base_directory, config)
+            )
+            fragment_set = prepare(
+                base_directory,
+                config,
+                strict=strict,
+                jobs=jobs,
+                cache=cache,
+                section_cache=section_cache,
+            )
+            if section_cache is not None:
+                section_cache.save()
+        if cache is not None:
+            cache.save()
+    fragment_filenames = [fragment.path for fragment in fragment_set.files]
 
     if project_name is None:
         project_name = config.name
         if not project_name:
-            package = config.package
-            if package:
-                project_name = get_project_name(
-                    os.path.abspath(os.path.join(base_directory, config.package_dir)),
-                    package,
-                )
+            if config.package:
+                with _timings.phase("name"):
+                    project_name = project.name
             else:
                 # Can't determine a project_name, but maybe it is not needed.
                 project_name = ""
@@ -208,38 +300,32 @@ def __main(
     if project_date is None:
         project_date = _get_date().strip()
 
-    # Render the title in the template if the title format is set to "". It can
-    # alternatively be set to False or a string, in either case it shouldn't be rendered
-    # in the template.
-    render_title = config.title_format == ""
-
-    rendered = render_fragments(
-        # The 0th underline is used for the top line
-        template,
-        config.issue_format,
-        fragments,
-        config.types,
-        config.underlines[1:],
-        config.wrap,
-        {"name": project_name, "version": project_version, "date": project_date},
-        top_underline=config.underlines[0],
-        all_bullets=config.all_bullets,
-        render_title=render_title,
-    )
+    if isinstance(fragment_set, FragmentSet):
+        # The data given to the template, without rendering it.
+        data = {
+            "name": project_name,
+            "version": project_version,
+            "date": project_date,
+            "sections": as_data(fragment_set, config),
+        }
+        click.echo("Draft only -- nothing has been written.", err=to_err)
+        click.echo(json.dumps(data, indent=2))
+        return
 
-    if config.title_format:
-        top_line = config.title_format.format(
-            name=project_name, version=project_version, project_date=project_date
+    click.echo("Rendering news fragments...", err=to_err)
+    with _timings.phase("render"):
+        content = render_prepared(
+            fragment_set,
+            config,
+            project_version,
+            project_name,
+            project_date,
+            template=template,
+            bytecode_cache_dir=(
+                None if no_cache else get_template_cache_dir(base_directory, config)
+            ),
         )
-        if is_markdown:
-            parts = [top_line]
-        else:
-            parts = [top_line, config.underlines[0] * len(top_line)]
-        parts.append(rendered)
-        content = "\n".join(parts)
-    else:
-        top_line = ""
-        content = rendered
+    top_line = get_top_line(config, project_name, project_version, project_date)
 
     if draft:
         click.echo(
@@ -260,17 +346,20 @@ def __main(
             name=project_name, version=project_version, project_date=project_date
         )
 
-    append_to_newsfile(
-        base_directory,
-        news_file,
-        config.start_string,
-        top_line,
-        content,
-        single_file=config.single_file,
-    )
+    with _timings.phase("write"):
+        append_to_newsfile(
+            base_directory,
+            news_file,
+            config.start_string,
+            top_line,
+            content,
+            single_file=config.single_file,
+            title_format=config.title_format or None,
+        )
 
     click.echo("Staging newsfile...", err=to_err)
-    _git.stage_newsfile(base_directory, news_file)
+    with _timings.phase("stage"):
+        _git.stage_newsfile(base_directory, news_file)
 
     if should_remove_fragment_files(
         fragment_filenames,
@@ -278,7 +367,8 @@ def __main(
         answer_keep,
     ):
         click.echo("Removing news fragments...", err=to_err)
-        _git.remove_files(fragment_filenames)
+        with _timings.phase("remove"):
+            _git.remove_files(fragment_filenames)
 
     click.echo("Done!", err=to_err)
 
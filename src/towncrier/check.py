@@ -13,8 +13,12 @@ from warnings import warn
 
 import click
 
-from ._builder import find_fragments
-from ._git import get_remote_branches, list_changed_files_compared_to_branch
+from ._builder import FragmentsPath, classify_fragments
+from ._git import (
+    get_remote_branches,
+    has_changes_compared_to_branch,
+    iter_changed_files_compared_to_branch,
+)
 from ._settings import config_option_help, load_config_from_options
 
 
@@ -38,7 +42,7 @@ def _get_default_compare_branch(branches: Container[str]) -> str | None:
     default=None,
     metavar="BRANCH",
     help=(
-        "Checks files changed running git diff --name-only BRANCH... "
+        "Checks news fragments changed running git diff --name-only BRANCH... "
         "BRANCH is the branch to be compared with. "
         "Default to origin/main"
     ),
@@ -65,7 +69,9 @@ def _main(compare_with: str | None, directory: str | None, config: str | None) -
 
 
 def __main(
-    comparewith: str | None, directory: str | None, config_path: str | None
+    comparewith: str | None,
+    directory: str | None,
+    config_path: str | None,
 ) -> None:
     base_directory, config = load_config_from_options(directory, config_path)
 
@@ -78,49 +84,54 @@ def __main(
         click.echo("Could not detect default branch. Aborting.")
         sys.exit(1)
 
+    news_file = os.path.normpath(os.path.join(base_directory, config.filename))
+    # Only the changes to the news file and the fragments matter.
+    fragments_path = FragmentsPath(base_directory, config)
+    paths = [news_file]
+    paths += sorted({fragments_path(section) for section in config.sections.values()})
+
     try:
-        files_changed = list_changed_files_compared_to_branch(
-            base_directory, comparewith
-        )
+        if not has_changes_compared_to_branch(base_directory, comparewith):
+            click.echo(
+                f"On {comparewith} branch, or no diffs, so no newsfragment required."
+            )
+            sys.exit(0)
+
+        files = {
+            os.path.abspath(path)
+            for path in iter_changed_files_compared_to_branch(
+                base_directory, comparewith, paths
+            )
+        }
     except CalledProcessError as e:
         click.echo("git produced output while failing:")
         click.echo(e.output)
         raise
 
-    if not files_changed:
-        click.echo(
-            f"On {comparewith} branch, or no diffs, so no newsfragment required."
-        )
-        sys.exit(0)
-
-    files = {os.path.abspath(path) for path in files_changed}
-
     click.echo("Looking at these files:")
     click.echo("----")
     for n, change in enumerate(files, start=1):
         click.echo(f"{n}. {change}")
     click.echo("----")
 
-    # This will fail if any fragment files have an invalid name:
-    all_fragment_files = find_fragments(base_directory, config, strict=True)[1]
+    # This will fail if any fragment files changed in the branch have an invalid name.
+    # Only their names are needed, so the other fragments aren't looked at.
+    fragment_files = classify_fragments(base_directory, config, files, strict=True)
 
-    news_file = os.path.normpath(os.path.join(base_directory, config.filename))
     if news_file in files:
         click.echo("Checks SKIPPED: news file changes detected.")
         sys.exit(0)
 
-    fragments = set()  # will only include fragments of types that are checked
-    unchecked_fragments = set()  # will include fragments of types that are not checked
-    for fragment_filename, category in all_fragment_files:
-        if config.types[category]["check"]:
-            fragments.add(fragment_filename)
+    fragments_in_branch = set()  # only includes fragments of types that are checked
+    unchecked_fragments_in_branch = set()  # fragments of types that are not checked
+    for fragment_file in fragment_files:
+        if config.types[fragment_file.category]["check"]:
+            fragments_in_branch.add(fragment_file.path)
         else:
-            unchecked_fragments.add(fragment_filename)
-    fragments_in_branch = fragments & files
+            unchecked_fragments_in_branch.add(fragment_file.path)
 
     if not fragments_in_branch:
-        unchecked_fragments_in_branch = unchecked_fragments & files
-        if unchecked_fragments:
+        if unchecked_fragments_in_branch:
             click.echo("Found newsfragments of unchecked types in the branch:")
             for n, fragment in enumerate(unchecked_fragments_in_branch, start=1):
                 click.echo(f"{n}. {fragment}")
@@ -52,6 +52,7 @@
       bar
 
 """
+import importlib
 import warnings
 
 import click
@@ -67,6 +68,8 @@ class DefaultGroup(click.Group):
 
     :param default_if_no_args: resolves to the default command if no arguments
                                passed.
+    :param lazy_commands: maps command names to the ``"module:attribute"`` import
+                          path of commands that are only imported when used.
 
     """
 
@@ -77,8 +80,21 @@ class DefaultGroup(click.Group):
         self.ignore_unknown_options = True
         self.default_cmd_name = kwargs.pop("default", None)
         self.default_if_no_args = kwargs.pop("default_if_no_args", False)
+        self.lazy_commands = dict(kwargs.pop("lazy_commands", {}))
         super().__init__(*args, **kwargs)
 
+    def add_lazy_command(self, name, import_path):
+        """Registers a command imported from `import_path` when first used."""
+        self.lazy_commands[name] = import_path
+
+    def list_commands(self, ctx):
+        return sorted({*self.commands, *self.lazy_commands})
+
+    def _load_lazy_command(self, cmd_name):
+        module_name, attribute = self.lazy_commands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        self.add_command(command, cmd_name)
+
     def set_default_command(self, command):
         """Sets a command function as the default command."""
         cmd_name = command.name
@@ -90,11 +106,23 @@ class DefaultGroup(click.Group):
             args.insert(0, self.default_cmd_name)
         return super().parse_args(ctx, args)
 
+    def invoke(self, ctx):
+        # Only options of the group were passed, so there's no command yet.
+        # Click 8.2 renamed `protected_args`.
+        attribute = (
+            "_protected_args" if hasattr(ctx, "_protected_args") else "protected_args"
+        )
+        if self.default_if_no_args and not getattr(ctx, attribute) and not ctx.args:
+            setattr(ctx, attribute, [self.default_cmd_name])
+        return super().invoke(ctx)
+
     def get_command(self, ctx, cmd_name):
-        if cmd_name not in self.commands:
+        if cmd_name not in self.commands and cmd_name not in self.lazy_commands:
             # No command name matched.
             ctx.arg0 = cmd_name
             cmd_name = self.default_cmd_name
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self._load_lazy_command(cmd_name)
         return super().get_command(ctx, cmd_name)
 
     def resolve_command(self, ctx, args):
@@ -14,7 +14,7 @@ from typing import cast
 
 import click
 
-from ._builder import FragmentsPath
+from ._builder import FragmentsPath, IgnoredFiles
 from ._settings import config_option_help, load_config_from_options
 
 
@@ -190,6 +190,12 @@ def __main(
     if filename_parts[-1] in config.types and filename_ext:
         filename += filename_ext
 
+    if IgnoredFiles(config)(os.path.basename(filename)):
+        raise click.BadParameter(
+            f"The news fragment name '{filename}' matches the 'ignore' "
+            "configuration, so it would never be included in the news file."
+        )
+
     get_fragments_path = FragmentsPath(base_directory, config)
     fragments_directory = get_fragments_path(section_directory=config.sections[section])
 
@@ -0,0 +1,317 @@
+"""
+Benchmark the build pipeline on synthetic projects of increasing size.
+
+Run it with ``nox -e benchmark`` or ``python -m towncrier.test.benchmark``. Each
+stage is timed on projects with 100 to 100k news fragments, spread across several
+sections and types, and compared against the timings stored in
+``benchmark_baseline.json`` in the current directory: the run fails if a stage got
+slower than the baseline by more than the tolerance. Use ``--save`` to record a new
+baseline.
+
+Timings depend on the machine, so the baseline isn't committed: record it on the
+machine that runs the comparison, before the change being measured.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Callable, Dict, Sequence
+
+import click
+
+from .._builder import find_fragments, render_fragments, split_fragments
+from .._settings import load_config_from_options
+from .._writer import append_to_newsfile
+from ..api import get_top_line, load_template
+
+
+BASELINE = "benchmark_baseline.json"
+
+SIZES = (100, 1_000, 10_000, 100_000)
+SECTIONS = ("", "plugins", "docs")
+TYPES = ("feature", "bugfix", "doc", "removal", "misc")
+# The releases already in the news file, which makes it about 5 MB.
+OLD_RELEASES = 1_000
+STAGES = (
+    "find_fragments",
+    "split_fragments",
+    "render_fragments",
+    "append_to_newsfile",
+    "build --draft",
+)
+
+# Regressions smaller than this are noise, whatever the tolerance.
+_NOISE_SECONDS = 0.01
+
+# The timings of each stage, for each number of fragments.
+Timings = Dict[str, Dict[str, float]]
+
+
+def make_project(directory: str, fragments: int) -> None:
+    """
+    Create a project in *directory* with *fragments* news fragments spread evenly
+    across `SECTIONS` and `TYPES`, and a news file with `OLD_RELEASES` previous
+    releases.
+
+    Every tenth fragment is an orphan, and every seventh one repeats the text of the
+    previous one so its issues are merged.
+    """
+    sections = "".join(
+        f'[[tool.towncrier.section]]\nname = "{path.title() or "Main"}"\n'
+        f'path = "{path}"\n\n'
+        for path in SECTIONS
+    )
+    with open(os.path.join(directory, "pyproject.toml"), "w", encoding="utf-8") as f:
+        f.write(
+            "[tool.towncrier]\n"
+            'directory = "changes"\n'
+            'title_format = "{name} {version} ({project_date})"\n'
+            'issue_format = "`#{issue} <https://example.com/{issue}>`_"\n\n' + sections
+        )
+    with open(os.path.join(directory, "NEWS.rst"), "w", encoding="utf-8") as f:
+        f.write("Release notes\n=============\n\n.. towncrier release notes start\n\n")
+        for i in reversed(range(OLD_RELEASES)):
+            title = f"Project 0.{i} (2000-01-01)"
+            f.write(f"{title}\n{'=' * len(title)}\n\nFeatures\n--------\n\n")
+            f.write(
+                "- An old change, with a description long enough to be wrapped on\n"
+                "  several lines by the template. (`#1 <https://example.com/1>`_)\n"
+                * 40
+                + "\n\n"
+            )
+
+    for path in SECTIONS:
+        os.makedirs(os.path.join(directory, "changes", path), exist_ok=True)
+    text = ""
+    for i in range(fragments):
+        section = SECTIONS[i % len(SECTIONS)]
+        category = TYPES[(i // len(SECTIONS)) % len(TYPES)]
+        issue = f"+{i}" if i % 10 == 0 else str(i)
+        if i % 7:
+            text = (
+                f"Change number {i} makes the project better, with a description "
+                "long enough to be wrapped on several lines by the template."
+            )
+        with open(
+            os.path.join(directory, "changes", section, f"{issue}.{category}"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write(text)
+
+
+def _best_of(repeat: int, function: Callable[[], object]) -> float:
+    """
+    Return the shortest time, in seconds, taken by *repeat* calls to *function*.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(fragments: int, repeat: int) -> dict[str, float]:
+    """
+    Time each stage of the build pipeline on a project with *fragments* news
+    fragments.
+    """
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        make_project(directory, fragments)
+        base_directory, config = load_config_from_options(directory, None)
+        template = load_template(config).source
+
+        timings["find_fragments"] = _best_of(
+            repeat, lambda: find_fragments(base_directory, config, strict=False)
+        )
+        contents, _ = find_fragments(base_directory, config, strict=False)
+
+        timings["split_fragments"] = _best_of(
+            repeat, lambda: split_fragments(contents, config.types, all_bullets=True)
+        )
+        split = split_fragments(contents, config.types, all_bullets=True)
+
+        def render() -> str:
+            return render_fragments(
+                template,
+                config.issue_format,
+                split,
+                config.types,
+                config.underlines[1:],
+                config.wrap,
+                {"name": "Project", "version": "1.0", "date": "2001-01-01"},
+                top_underline=config.underlines[0],
+                all_bullets=config.all_bullets,
+                render_title=config.title_format == "",
+                wrap_width=config.wrap_width,
+            )
+
+        # The first render compiles the template, which isn't timed.
+        content = render()
+        timings["render_fragments"] = _best_of(repeat, render)
+
+        top_line = get_top_line(config, "Project", "1.0", "2001-01-01")
+        news_file = os.path.join(directory, "NEWS.rst")
+        with open(news_file, encoding="utf-8") as f:
+            news = f.read()
+
+        append_timings = []
+        for _ in range(repeat):
+            # Rewriting the original news file isn't timed.
+            with open(news_file, "w", encoding="utf-8") as f:
+                f.write(news)
+            start = time.perf_counter()
+            append_to_newsfile(
+                directory,
+                "NEWS.rst",
+                config.start_string,
+                top_line,
+                content,
+                single_file=True,
+                title_format=config.title_format or None,
+            )
+            append_timings.append(time.perf_counter() - start)
+        timings["append_to_newsfile"] = min(append_timings)
+
+        timings["build --draft"] = _best_of(
+            repeat,
+            lambda: subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "towncrier",
+                    "build",
+                    "--draft",
+                    "--name",
+                    "Project",
+                    "--version",
+                    "1.0",
+                ],
+                cwd=directory,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ),
+        )
+
+    return timings
+
+
+def find_regressions(
+    timings: Timings, baseline: Timings, tolerance: float
+) -> list[str]:
+    """
+    Return a description of each stage that is slower than in *baseline* by more
+    than *tolerance* times.
+    """
+    regressions = []
+    for size, stages in timings.items():
+        for stage, seconds in stages.items():
+            expected = baseline.get(size, {}).get(stage)
+            if expected is None:
+                continue
+            if seconds > expected * tolerance and seconds - expected > _NOISE_SECONDS:
+                regressions.append(
+                    f"{stage} with {size} fragments: {seconds:.3f}s, "
+                    f"was {expected:.3f}s"
+                )
+    return regressions
+
+
+@click.command()
+@click.option(
+    "--size",
+    "sizes",
+    type=int,
+    multiple=True,
+    default=SIZES,
+    show_default=True,
+    help="Number of news fragments of a project. Can be given multiple times.",
+)
+@click.option(
+    "--repeat",
+    default=3,
+    show_default=True,
+    help="Time each stage this many times and keep the best time.",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    default=BASELINE,
+    metavar="FILE_PATH",
+    help="The JSON file with the baseline timings.",
+)
+@click.option(
+    "--tolerance",
+    default=1.5,
+    show_default=True,
+    help="Fail if a stage is slower than the baseline by more than this factor.",
+)
+@click.option(
+    "--save",
+    is_flag=True,
+    help="Save the timings as the new baseline instead of comparing them.",
+)
+def main(
+    sizes: Sequence[int],
+    repeat: int,
+    baseline_path: str,
+    tolerance: float,
+    save: bool,
+) -> None:
+    """
+    Benchmark the build pipeline on synthetic projects.
+    """
+    timings: Timings = {}
+    click.echo(f"{'fragments':>10}  " + "  ".join(f"{s:>18}" for s in STAGES))
+    for size in sizes:
+        timings[str(size)] = run_benchmark(size, repeat)
+        click.echo(
+            f"{size:>10}  "
+            + "  ".join(f"{timings[str(size)][s]:>17.3f}s" for s in STAGES)
+        )
+
+    if save:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "timings": {
+                        size: {stage: round(t, 4) for stage, t in stages.items()}
+                        for size, stages in timings.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        click.echo(f"Saved the baseline to {baseline_path}.")
+        return
+
+    try:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)["timings"]
+    except FileNotFoundError:
+        click.echo(f"No baseline at {baseline_path}, use --save to create one.")
+        return
+
+    regressions = find_regressions(timings, baseline, tolerance)
+    if regressions:
+        click.echo("Slower than the baseline:", err=True)
+        for regression in regressions:
+            click.echo(f"  {regression}", err=True)
+        sys.exit(1)
+    click.echo("No regression.")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
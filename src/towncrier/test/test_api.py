@@ -0,0 +1,149 @@
+import os
+
+from unittest.mock import patch
+
+from twisted.trial.unittest import TestCase
+
+from .. import api
+from .._builder import _get_environment
+from .._settings import load_config_from_options
+from .._settings.load import Config
+from ..build import _main
+from .helpers import with_project, write
+
+
+class TestApi(TestCase):
+    @with_project()
+    def test_render_like_build(self, runner):
+        """
+        Collecting and rendering the news fragments gives the news that `build`
+        writes, without writing or removing anything.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        write("foo/newsfragments/124.bugfix", "Fixes gravity")
+        base_directory, config = load_config_from_options(None, None)
+
+        fragment_set = api.collect(base_directory, config)
+        content = api.render(
+            fragment_set, config, "1.2.3", "Foo", project_date="01-01-2001"
+        )
+
+        self.assertEqual(
+            sorted(os.listdir("foo/newsfragments")), ["123.feature", "124.bugfix"]
+        )
+        self.assertFalse(os.path.exists("NEWS.rst"))
+        self.assertEqual(
+            [(f.issue, f.category) for f in sorted(fragment_set.files)],
+            [("123", "feature"), ("124", "bugfix")],
+        )
+
+        result = runner.invoke(_main, ["--date", "01-01-2001", "--yes"])
+        self.assertEqual(0, result.exit_code, result.output)
+        with open("NEWS.rst") as f:
+            self.assertEqual(f.read(), content.rstrip() + "\n")
+
+    @with_project()
+    def test_reuse_template(self, runner):
+        """
+        A loaded template can be reused for many renders, and is only compiled
+        once.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        base_directory, config = load_config_from_options(None, None)
+        template = api.load_template(config)
+        self.assertFalse(template.is_markdown)
+        # Make sure the template wasn't compiled by another test.
+        template = template._replace(source=template.source + "{# test_reuse #}")
+        environment = _get_environment(None)
+
+        with patch.object(environment, "compile", wraps=environment.compile) as compile:
+            renders = {
+                api.render(
+                    api.collect(base_directory, config),
+                    config,
+                    version,
+                    "Foo",
+                    project_date="01-01-2001",
+                    template=template,
+                )
+                for version in ["1.0", "1.0", "2.0"]
+            }
+
+        compile.assert_called_once()
+        self.assertEqual(len(renders), 2)
+        self.assertTrue(all("Adds levitation" in render for render in renders))
+
+    @with_project()
+    def test_as_data(self, runner):
+        """
+        The collected fragments can be turned into plain data instead of being
+        rendered.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        base_directory, config = load_config_from_options(None, None)
+
+        data = api.as_data(api.collect(base_directory, config), config)
+
+        self.assertEqual(
+            data[0]["categories"][0]["entries"],
+            [
+                {
+                    "text": "Adds levitation",
+                    "issues": ["123"],
+                    "files": [os.path.abspath("foo/newsfragments/123.feature")],
+                }
+            ],
+        )
+
+    @with_project()
+    def test_load_config(self, runner):
+        """
+        The configuration is found from the given or current directory, or read
+        from the given file, like the command line does.
+        """
+        os.mkdir("sub")
+        write("sub/towncrier.toml", '[tool.towncrier]\npackage = "bar"\n')
+
+        base_directory, config = api.load_config()
+        self.assertEqual(base_directory, os.getcwd())
+        self.assertEqual(config.package, "foo")
+        self.assertEqual(api.load_config("sub")[1].package, "bar")
+        base_directory, config = api.load_config(config_path="sub/towncrier.toml")
+        self.assertEqual(base_directory, os.path.abspath("sub"))
+        self.assertEqual(config.package, "bar")
+        self.assertRaises(api.ConfigError, api.load_config, config_path="missing.toml")
+
+    @with_project()
+    def test_load_config_cache(self, runner):
+        """
+        With the cache, the configuration isn't searched for again until the cache
+        is cleared.
+        """
+        self.addCleanup(api.clear_config_cache)
+        api.load_config(cache=True)
+
+        with patch("towncrier._settings.load.load_config_from_file") as load:
+            self.assertEqual(api.load_config(cache=True)[1].package, "foo")
+            load.assert_not_called()
+            api.clear_config_cache()
+            api.load_config(cache=True)
+        load.assert_called_once()
+
+    def test_top_line(self):
+        """
+        The top line is the formatted title, unless the template renders it.
+        """
+        config = Config(
+            sections={"": ""},
+            types={},
+            template=("towncrier.templates", "default.rst"),
+            start_string="",
+            title_format="{name} {version} ({project_date})",
+        )
+
+        self.assertEqual(
+            api.get_top_line(config, "Foo", "1.0", "01-01-2001"),
+            "Foo 1.0 (01-01-2001)",
+        )
+        config.title_format = ""
+        self.assertEqual(api.get_top_line(config, "Foo", "1.0", "01-01-2001"), "")
@@ -0,0 +1,66 @@
+import os
+
+from tempfile import TemporaryDirectory
+
+from twisted.trial.unittest import TestCase
+
+from .benchmark import (
+    OLD_RELEASES,
+    SECTIONS,
+    STAGES,
+    TYPES,
+    find_regressions,
+    make_project,
+    run_benchmark,
+)
+
+
+class TestBenchmark(TestCase):
+    def test_make_project(self):
+        """
+        The synthetic projects have the requested number of news fragments, across
+        all the sections, and a news file with many releases.
+        """
+        with TemporaryDirectory() as directory:
+            make_project(directory, 30)
+
+            for section in SECTIONS:
+                path = os.path.join(directory, "changes", section)
+                names = [
+                    name
+                    for name in os.listdir(path)
+                    if os.path.isfile(os.path.join(path, name))
+                ]
+                self.assertEqual(len(names), 10)
+                self.assertEqual(
+                    {os.path.splitext(name)[1][1:] for name in names}, set(TYPES)
+                )
+
+            with open(os.path.join(directory, "NEWS.rst")) as f:
+                news = f.read()
+            self.assertEqual(news.count(" (2000-01-01)\n"), OLD_RELEASES)
+
+    def test_run_benchmark(self):
+        """
+        Every stage is timed.
+        """
+        timings = run_benchmark(10, repeat=1)
+
+        self.assertEqual(sorted(timings), sorted(STAGES))
+
+    def test_find_regressions(self):
+        """
+        Only stages slower than the baseline by more than the tolerance, and by more
+        than the noise, are regressions.
+        """
+        baseline = {"100": {"find_fragments": 1.0, "split_fragments": 0.001}}
+        timings = {
+            "100": {"find_fragments": 2.0, "split_fragments": 0.005},
+            "1000": {"find_fragments": 10.0},
+        }
+
+        self.assertEqual(
+            find_regressions(timings, baseline, 1.5),
+            ["find_fragments with 100 fragments: 2.000s, was 1.000s"],
+        )
+        self.assertEqual(find_regressions(timings, baseline, 3), [])
@@ -1,8 +1,10 @@
 # Copyright (c) Amber Brown, 2015
 # See LICENSE for details.
 
+import json
 import os
 import tempfile
+import time
 
 from datetime import date
 from pathlib import Path
@@ -13,6 +15,7 @@ from unittest.mock import patch
 from click.testing import CliRunner
 from twisted.trial.unittest import TestCase
 
+from .. import api
 from .._shell import cli
 from ..build import _main
 from .helpers import read, read_pkg_resource, with_git_project, with_project, write
@@ -22,7 +25,7 @@ class TestCli(TestCase):
     maxDiff = None
 
     @with_project()
-    def _test_command(self, command, runner):
+    def _test_command(self, command, runner, extra_args=()):
         # Off the shelf newsfragment
         with open("foo/newsfragments/123.feature", "w") as f:
             f.write("Adds levitation")
@@ -56,7 +59,9 @@ class TestCli(TestCase):
         with open("foo/newsfragments/README.rst", "w") as f:
             f.write("**Blah blah**")
 
-        result = runner.invoke(command, ["--draft", "--date", "01-01-2001"])
+        result = runner.invoke(
+            command, ["--draft", "--date", "01-01-2001", *extra_args]
+        )
 
         self.assertEqual(0, result.exit_code, result.output)
         self.assertEqual(
@@ -98,6 +103,12 @@ class TestCli(TestCase):
     def test_subcommand(self):
         self._test_command(_main)
 
+    def test_jobs(self):
+        """
+        Reading the news fragments with several threads renders the same output.
+        """
+        self._test_command(_main, extra_args=["--jobs", "4"])
+
     @with_project()
     def test_in_different_dir_dir_option(self, runner):
         """
@@ -415,6 +426,147 @@ class TestCli(TestCase):
         self.assertEqual(0, result.exit_code)
         self.assertIn(f"Foo 1.2.3 ({today.isoformat()})", result.output)
 
+    @with_project()
+    def test_draft_json(self, runner):
+        """
+        With --format json, the draft is the structured data of the news
+        fragments, in rendering order and with their paths, and the template isn't
+        rendered.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        write("foo/newsfragments/122.feature.rst", "Adds levitation")
+        write("foo/newsfragments/124.feature", "Extends levitation")
+        write("foo/newsfragments/+orphan.bugfix", "Fixes gravity")
+        write("foo/newsfragments/125.removal", "Removes antigravity")
+
+        with patch("towncrier.build.render_prepared") as render:
+            result = CliRunner(mix_stderr=False).invoke(
+                _main, ["--draft", "--format", "json", "--date", "01-01-2001"]
+            )
+        render.assert_not_called()
+
+        self.assertEqual(0, result.exit_code, result.output)
+        news = os.path.abspath("foo/newsfragments")
+        self.assertEqual(
+            json.loads(result.stdout),
+            {
+                "name": "Foo",
+                "version": "1.2.3",
+                "date": "01-01-2001",
+                "sections": [
+                    {
+                        "name": "",
+                        "categories": [
+                            {
+                                "category": "feature",
+                                "name": "Features",
+                                "entries": [
+                                    {
+                                        "text": "Adds levitation",
+                                        "issues": ["122", "123"],
+                                        "files": [
+                                            os.path.join(news, "122.feature.rst"),
+                                            os.path.join(news, "123.feature"),
+                                        ],
+                                    },
+                                    {
+                                        "text": "Extends levitation",
+                                        "issues": ["124"],
+                                        "files": [os.path.join(news, "124.feature")],
+                                    },
+                                ],
+                            },
+                            {
+                                "category": "bugfix",
+                                "name": "Bugfixes",
+                                "entries": [
+                                    {
+                                        "text": "Fixes gravity",
+                                        "issues": [],
+                                        "files": [os.path.join(news, "+orphan.bugfix")],
+                                    }
+                                ],
+                            },
+                            {
+                                "category": "removal",
+                                "name": "Deprecations and Removals",
+                                "entries": [
+                                    {
+                                        "text": "Removes antigravity",
+                                        "issues": ["125"],
+                                        "files": [os.path.join(news, "125.removal")],
+                                    }
+                                ],
+                            },
+                        ],
+                    }
+                ],
+            },
+        )
+
+    @with_project()
+    def test_format_requires_draft(self, runner):
+        """
+        --format can only be used with --draft.
+        """
+        result = runner.invoke(_main, ["--format", "json"])
+
+        self.assertEqual(2, result.exit_code)
+        self.assertIn("'--format' can only be used with '--draft'.", result.output)
+
+    @with_project()
+    def test_timings_summary(self, runner):
+        """
+        --timings - prints the time of each phase of the build, and what was read,
+        to standard error.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        write("foo/newsfragments/124.bugfix", "Fixes gravity")
+
+        result = CliRunner(mix_stderr=False).invoke(
+            _main, ["--draft", "--date", "01-01-2001", "--timings", "-"]
+        )
+
+        self.assertEqual(0, result.exit_code, result.stderr)
+        self.assertNotIn("Timings:", result.stdout)
+        summary = result.stderr.split("Timings:\n")[1]
+        phases = [line.split()[0] for line in summary.splitlines()[:6]]
+        self.assertEqual(
+            phases, ["config", "version", "template", "fragments", "name", "render"]
+        )
+        self.assertIn("  total ", summary)
+        self.assertTrue(
+            summary.endswith("Counters:\n  bytes read     28\n  files scanned  2\n")
+        )
+
+    @with_git_project()
+    def test_timings_json(self, runner, commit):
+        """
+        TOWNCRIER_PROFILE is the default of --timings, and with a path the timings
+        and counters are written as JSON.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        commit()
+
+        result = runner.invoke(
+            _main,
+            ["--date", "01-01-2001", "--yes"],
+            env={"TOWNCRIER_PROFILE": "timings.json"},
+        )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        with open("timings.json") as f:
+            timings = json.load(f)
+        self.assertEqual(
+            [phase["name"] for phase in timings["phases"]],
+            ["config", "version", "template", "fragments", "name", "render"]
+            + ["write", "stage", "remove"],
+        )
+        self.assertEqual(set(timings["total"]), {"name", "wall", "cpu"})
+        self.assertEqual(timings["counters"]["bytes read"], 15)
+        # Staging the news file; the fragments to remove are found in the index.
+        self.assertEqual(timings["counters"]["subprocesses"], 2)
+
     @with_git_project()
     def test_no_confirmation(self, runner, commit):
         fragment_path1 = "foo/newsfragments/123.feature"
@@ -1770,3 +1922,99 @@ class TestCli(TestCase):
             _main, ["--draft", "--date", "01-01-2001", "--version", "1.0.0"]
         )
         self.assertEqual(0, result.exit_code, result.output)
+
+    @with_project(
+        config="""
+        [tool.towncrier]
+        package = "foo"
+        cache_dir = ".towncrier-cache"
+        """
+    )
+    def test_fragment_cache(self, runner):
+        """
+        When `cache_dir` is configured, unchanged news fragments are not read again
+        unless `--no-cache` is passed, and the compiled template is cached too.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        past = time.time() - 60
+        os.utime("foo/newsfragments/123.feature", (past, past))
+        args = ["--draft", "--date", "01-01-2001"]
+
+        result = runner.invoke(_main, args)
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertTrue(os.path.isfile(".towncrier-cache/fragments.json"))
+        self.assertTrue(os.listdir(".towncrier-cache/templates"))
+
+        with patch("towncrier._builder.read_fragment") as read_fragment:
+            cached_result = runner.invoke(_main, args)
+        self.assertEqual(0, cached_result.exit_code, cached_result.output)
+        read_fragment.assert_not_called()
+        self.assertEqual(result.output, cached_result.output)
+        self.assertIn("- Adds levitation (#123)", cached_result.output)
+
+        with patch(
+            "towncrier._builder.read_fragment", return_value="Adds flight"
+        ) as read_fragment:
+            result = runner.invoke(_main, args + ["--no-cache"])
+        self.assertEqual(0, result.exit_code, result.output)
+        read_fragment.assert_called_once()
+        self.assertIn("- Adds flight (#123)", result.output)
+
+    @with_project(
+        config="""
+        [tool.towncrier]
+        package = "foo"
+        cache_dir = ".towncrier-cache"
+
+        [[tool.towncrier.section]]
+        path = ""
+
+        [[tool.towncrier.section]]
+        name = "Web"
+        path = "web"
+        """
+    )
+    def test_section_cache(self, runner):
+        """
+        When `cache_dir` is configured, only the sections whose news fragments
+        changed since the last build are read and prepared again, and the whole
+        news file is still rendered.
+        """
+        write("foo/newsfragments/123.feature", "Adds levitation")
+        write("foo/web/newsfragments/124.bugfix", "Fixes the website")
+        past = time.time() - 60
+        for path in [
+            "foo/newsfragments/123.feature",
+            "foo/web/newsfragments/124.bugfix",
+        ]:
+            os.utime(path, (past, past))
+        args = ["--draft", "--date", "01-01-2001"]
+
+        result = runner.invoke(_main, args)
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertTrue(os.path.isfile(".towncrier-cache/sections.json"))
+
+        with patch("towncrier.api.read_fragments") as read_fragments:
+            cached_result = runner.invoke(_main, args)
+        self.assertEqual(0, cached_result.exit_code, cached_result.output)
+        read_fragments.assert_not_called()
+        self.assertEqual(result.output, cached_result.output)
+
+        write("foo/web/newsfragments/125.bugfix", "Fixes the web site again")
+        os.utime("foo/web/newsfragments/125.bugfix", (past, past))
+        with patch(
+            "towncrier.api.read_fragments", wraps=api.read_fragments
+        ) as read_fragments:
+            result = runner.invoke(_main, args)
+        self.assertEqual(0, result.exit_code, result.output)
+        read_fragments.assert_called_once()
+        self.assertEqual(
+            sorted(map(os.path.basename, read_fragments.call_args[0][0])),
+            ["124.bugfix", "125.bugfix"],
+        )
+        self.assertIn("- Adds levitation (#123)", result.output)
+        self.assertIn("- Fixes the web site again (#125)", result.output)
+
+        result = runner.invoke(_main, args + ["--no-cache"])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("- Fixes the web site again (#125)", result.output)
@@ -1,11 +1,36 @@
 # Copyright (c) Povilas Kanapickas, 2019
 # See LICENSE for details.
 
+import os
+import textwrap
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from textwrap import dedent
+from unittest.mock import patch
 
+from click import ClickException
 from twisted.trial.unittest import TestCase
 
-from .._builder import parse_newfragment_basename, render_fragments
+from .._builder import (
+    FragmentFile,
+    IgnoredFiles,
+    IssueMemo,
+    PreparedSection,
+    _template_sources,
+    classify_fragments,
+    discover_fragments,
+    find_fragments,
+    get_template,
+    issue_key,
+    parse_newfragment_basename,
+    prepare_sections,
+    render_fragments,
+    render_issue,
+    split_fragments,
+    wrap_line,
+)
+from .._settings.load import Config
 
 
 class TestParseNewsfragmentBasename(TestCase):
@@ -140,6 +165,431 @@ class TestParseNewsfragmentBasename(TestCase):
         )
 
 
+class TestDiscoverFragments(TestCase):
+    def make_config(self, directory="news"):
+        """
+        Return a Config storing its news fragments in a fresh temporary directory.
+        """
+        base_directory = self.mktemp()
+        os.makedirs(os.path.join(base_directory, "news"))
+        config = Config(
+            sections={"": ""},
+            types={"feature": {"name": "Features", "showcontent": True, "check": True}},
+            template=("towncrier.templates", "default.rst"),
+            start_string=".. towncrier release notes start\n",
+            directory=directory,
+        )
+        return os.path.abspath(base_directory), config
+
+    def test_discover(self):
+        """
+        Fragments are discovered with their section, issue, category and counter.
+        """
+        base_directory, config = self.make_config()
+        news = Path(base_directory, "news")
+        news.joinpath("123.feature").write_text("Adds levitation")
+        news.joinpath("123.feature.1.rst").write_text("Extends levitation")
+        news.joinpath("+orphan.feature").write_text("Orphaned feature")
+        news.joinpath("README.rst").write_text("Ignored")
+
+        fragments = discover_fragments(base_directory, config, strict=False)
+
+        self.assertEqual(
+            sorted(fragments),
+            [
+                FragmentFile(
+                    "", str(news.joinpath("+orphan.feature")), "", "feature", 0
+                ),
+                FragmentFile(
+                    "", str(news.joinpath("123.feature")), "123", "feature", 0
+                ),
+                FragmentFile(
+                    "", str(news.joinpath("123.feature.1.rst")), "123", "feature", 1
+                ),
+            ],
+        )
+
+    def test_does_not_read_content(self):
+        """
+        Discovering fragments doesn't read their content, while finding them does.
+        """
+        base_directory, config = self.make_config()
+        Path(base_directory, "news", "123.feature").write_text("Adds levitation")
+
+        with patch("towncrier._builder.read_fragment") as read_fragment:
+            discover_fragments(base_directory, config, strict=False)
+        read_fragment.assert_not_called()
+
+        content, files = find_fragments(base_directory, config, strict=False)
+        self.assertEqual(content, {"": {("123", "feature", 0): "Adds levitation"}})
+        self.assertEqual(
+            files, [(os.path.join(base_directory, "news", "123.feature"), "feature")]
+        )
+
+    def test_find_with_jobs(self):
+        """
+        Reading the fragments with a thread pool gives the same result as reading
+        them one by one.
+        """
+        base_directory, config = self.make_config()
+        for issue in range(20):
+            Path(base_directory, "news", f"{issue}.feature").write_text(
+                f"Issue {issue}"
+            )
+
+        sequential = find_fragments(base_directory, config, strict=False, jobs=1)
+        concurrent = find_fragments(base_directory, config, strict=False, jobs=4)
+
+        self.assertEqual(sequential, concurrent)
+        self.assertEqual(
+            list(sequential[0][""].items()), list(concurrent[0][""].items())
+        )
+        self.assertEqual(
+            sequential[0][""][("7", "feature", 0)],
+            "Issue 7",
+        )
+
+    def test_skips_directories(self):
+        """
+        Directories inside a fragments directory are not news fragments, even in
+        strict mode.
+        """
+        base_directory, config = self.make_config()
+        os.makedirs(os.path.join(base_directory, "news", "124.feature"))
+        os.makedirs(os.path.join(base_directory, "news", "subsection"))
+
+        self.assertEqual(discover_fragments(base_directory, config, strict=True), [])
+
+    def test_missing_directory(self):
+        """
+        A section without a fragments directory has no fragments.
+        """
+        base_directory, config = self.make_config(directory="missing")
+
+        self.assertEqual(discover_fragments(base_directory, config, strict=True), [])
+        self.assertEqual(
+            find_fragments(base_directory, config, strict=True), ({"": {}}, [])
+        )
+
+    def test_classify(self):
+        """
+        Only the given paths are classified, and the files that aren't news
+        fragments, are outside of the fragments directory or don't exist are
+        left out.
+        """
+        base_directory, config = self.make_config()
+        news = Path(base_directory, "news")
+        news.joinpath("123.feature").write_text("Adds levitation")
+        news.joinpath("+orphan.feature").write_text("Orphaned feature")
+        news.joinpath("README.rst").write_text("Ignored")
+        news.joinpath("invalid").write_text("Not looked at")
+        Path(base_directory, "124.feature").write_text("Outside")
+        paths = [
+            str(news.joinpath(name))
+            for name in ["123.feature", "+orphan.feature", "README.rst", "5.feature"]
+        ] + [os.path.join(base_directory, "124.feature")]
+
+        with patch("towncrier._builder.read_fragment") as read_fragment:
+            fragments = classify_fragments(base_directory, config, paths, strict=True)
+        read_fragment.assert_not_called()
+
+        self.assertEqual(
+            fragments,
+            [
+                FragmentFile(
+                    "", str(news.joinpath("123.feature")), "123", "feature", 0
+                ),
+                FragmentFile(
+                    "", str(news.joinpath("+orphan.feature")), "", "feature", 0
+                ),
+            ],
+        )
+
+    def test_classify_strict(self):
+        """
+        In strict mode, classifying a path with an invalid fragment name fails.
+        """
+        base_directory, config = self.make_config()
+        invalid = Path(base_directory, "news", "invalid")
+        invalid.write_text("Invalid")
+
+        self.assertEqual(
+            classify_fragments(base_directory, config, [str(invalid)], strict=False),
+            [],
+        )
+        with self.assertRaises(ClickException):
+            classify_fragments(base_directory, config, [str(invalid)], strict=True)
+
+
+class TestIgnoredFiles(TestCase):
+    def make_config(self, ignore=None, template=("towncrier", "default.rst")):
+        return Config(
+            sections={"": ""},
+            types={},
+            template=template,
+            start_string="",
+            ignore=ignore,
+        )
+
+    def test_default_names(self):
+        """
+        Files like README and .gitignore are always ignored, whatever their case.
+        """
+        is_ignored = IgnoredFiles(self.make_config())
+
+        self.assertTrue(is_ignored(".gitignore"))
+        self.assertTrue(is_ignored("README.rst"))
+        self.assertTrue(is_ignored("readme"))
+        self.assertFalse(is_ignored("123.feature"))
+
+    def test_template_basename(self):
+        """
+        A template file stored with the fragments is ignored.
+        """
+        is_ignored = IgnoredFiles(self.make_config(template="/path/to/template.j2"))
+
+        self.assertTrue(is_ignored("template.j2"))
+        self.assertFalse(is_ignored("template.j2.feature"))
+
+    def test_configured_names_and_wildcards(self):
+        """
+        Configured names are matched exactly, and wildcards follow `fnmatch` rules.
+        """
+        is_ignored = IgnoredFiles(
+            self.make_config(ignore=["Notes.TXT", "*.md", "draft-?", "seq_[ab]"])
+        )
+
+        self.assertTrue(is_ignored("notes.txt"))
+        self.assertFalse(is_ignored("notes.txt.feature"))
+        self.assertTrue(is_ignored("CHANGES.MD"))
+        self.assertTrue(is_ignored("draft-1"))
+        self.assertFalse(is_ignored("draft-12"))
+        self.assertTrue(is_ignored("seq_a"))
+        self.assertFalse(is_ignored("seq_c"))
+        self.assertFalse(is_ignored("123.feature"))
+
+
+class TestSplitFragments(TestCase):
+    definitions = {
+        "feature": {"name": "Features", "showcontent": True},
+        "misc": {"name": "Misc", "showcontent": False},
+    }
+
+    def test_issues_grouped_by_text(self):
+        """
+        Issues of fragments with the same text are grouped and sorted, and the
+        content of categories that don't show it is dropped.
+        """
+        fragments = {
+            "": {
+                ("3", "misc", 0): "Refactored",
+                ("1", "misc", 0): "Cleaned up",
+                ("2", "misc", 0): "Tweaked",
+                ("12", "feature", 0): "Adds levitation\n",
+                ("10", "feature", 0): "Adds levitation",
+                ("", "feature", 0): "Orphaned feature",
+            },
+            "Web": {},
+        }
+
+        self.assertEqual(
+            split_fragments(fragments, self.definitions),
+            {
+                "": {
+                    "misc": {"": ["1", "2", "3"]},
+                    "feature": {
+                        "Adds levitation": ["10", "12"],
+                        "Orphaned feature": [],
+                    },
+                },
+                "Web": {},
+            },
+        )
+
+
+class TestPrepareSections(TestCase):
+    definitions = TestSplitFragments.definitions
+    sections = {
+        "": {
+            ("3", "misc", 0): "Refactored",
+            ("12", "feature", 0): "Adds levitation",
+            ("10", "feature", 0): "Adds levitation",
+        },
+        "Web": {("gh-4", "feature", 0): "Adds a website"},
+        "Docs": {},
+    }
+
+    def test_prepare_sections(self):
+        """
+        The entries of each section are sorted and their issues rendered, in the
+        order of the sections.
+        """
+        prepared = prepare_sections(self.sections, self.definitions, True, "#{issue}")
+
+        self.assertEqual(list(prepared), ["", "Web", "Docs"])
+        self.assertEqual(
+            prepared[""],
+            PreparedSection(
+                {"misc": {"": ["#3"]}, "feature": {"Adds levitation": ["#10", "#12"]}},
+                {"misc": ["#3"], "feature": ["#10", "#12"]},
+            ),
+        )
+        self.assertEqual(prepared["Docs"], PreparedSection({}, {}))
+
+    def test_processes(self):
+        """
+        With more than one job, the sections are prepared by worker processes with
+        the same result.
+        """
+        expected = prepare_sections(self.sections, self.definitions, True, "#{issue}")
+
+        with patch("towncrier._builder._MIN_PARALLEL_FRAGMENTS", 0), patch(
+            "os.cpu_count", return_value=4
+        ), patch(
+            "towncrier._builder.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as executor:
+            prepared = prepare_sections(
+                self.sections, self.definitions, True, "#{issue}", jobs=2
+            )
+
+        executor.assert_called_once_with(max_workers=2)
+        self.assertEqual(list(prepared), list(expected))
+        self.assertEqual(prepared, expected)
+
+    def test_few_fragments(self):
+        """
+        Processes aren't used when there are too few news fragments.
+        """
+        with patch("towncrier._builder.ProcessPoolExecutor") as executor:
+            prepare_sections(self.sections, self.definitions, True, None, jobs=4)
+
+        executor.assert_not_called()
+
+
+class TestIssueMemo(TestCase):
+    def test_memoized(self):
+        """
+        Each distinct issue is parsed and rendered once.
+        """
+        memo = IssueMemo("`{issue}`")
+
+        with patch("towncrier._builder.issue_key", wraps=issue_key) as key:
+            self.assertEqual(
+                sorted(["gh-10", "2", "gh-4", "2"], key=memo.key),
+                ["gh-4", "gh-10", "2", "2"],
+            )
+            self.assertEqual(memo.key("gh-10"), issue_key("gh-10"))
+        self.assertEqual(key.call_count, 3)
+
+        with patch("towncrier._builder.render_issue", wraps=render_issue) as render:
+            self.assertEqual(memo.render("2"), "`2`")
+            self.assertEqual(memo.render("2"), "`2`")
+        render.assert_called_once_with("`{issue}`", "2")
+
+    def test_split_fragments(self):
+        """
+        When given to `split_fragments`, issues are sorted like they are rendered.
+        """
+        fragments = {
+            "": {
+                ("10", "feature", 0): "Adds levitation",
+                ("9", "feature", 0): "Adds levitation",
+                ("gh-3", "feature", 0): "Adds levitation",
+            }
+        }
+        definitions = {"feature": {"showcontent": True}}
+
+        self.assertEqual(
+            split_fragments(fragments, definitions)[""]["feature"],
+            {"Adds levitation": ["10", "9", "gh-3"]},
+        )
+        self.assertEqual(
+            split_fragments(fragments, definitions, issue_memo=IssueMemo(None))[""][
+                "feature"
+            ],
+            {"Adds levitation": ["gh-3", "9", "10"]},
+        )
+
+
+class TestWrapLine(TestCase):
+    def test_same_as_textwrap(self):
+        """
+        Lines are wrapped exactly like `textwrap.fill` does, including those that
+        are short enough to be returned without calling it.
+        """
+        lines = [
+            "",
+            "   ",
+            "Features",
+            "--------",
+            "- Short entry (#1)",
+            "- Short entry with trailing spaces   ",
+            "- Short entry with\ttab",
+            "  - Indented entry\xa0",
+            "- " + "long words " * 10 + "(#2)",
+            "#. " + "x" * 100,
+        ]
+        for line in lines:
+            for width in (20, 79):
+                self.assertEqual(
+                    wrap_line(line, width, "  "),
+                    textwrap.fill(
+                        line,
+                        width=width,
+                        subsequent_indent="  ",
+                        break_long_words=False,
+                        break_on_hyphens=False,
+                    ),
+                )
+
+    def test_short_line_unchanged(self):
+        """
+        Lines that fit are returned as they are.
+        """
+        with patch("textwrap.fill") as fill:
+            self.assertEqual(wrap_line("- Short entry", 79, "  "), "- Short entry")
+        fill.assert_not_called()
+
+
+class TestGetTemplate(TestCase):
+    def test_compiled_once(self):
+        """
+        Templates with the same source are compiled once.
+        """
+        template = get_template("{{ x }}\n{% if x %}\nyes\n{% endif %}\n")
+
+        self.assertIs(get_template("{{ x }}\n{% if x %}\nyes\n{% endif %}\n"), template)
+        self.assertIsNot(get_template("{{ y }}"), template)
+        # Blocks are trimmed, like in the bundled templates.
+        self.assertEqual(template.render(x=1), "1\nyes\n")
+
+    def test_sources_bounded(self):
+        """
+        Only the sources of the most recently used templates are kept, and evicted
+        templates can still be used.
+        """
+        with patch("towncrier._builder._TEMPLATE_CACHE_SIZE", 2):
+            get_template("{{ x }} evicted")
+            get_template("{{ x }} kept")
+            get_template("{{ x }} kept")
+            get_template("{{ x }} newest")
+
+            self.assertEqual(len(_template_sources), 2)
+            self.assertNotIn("{{ x }} evicted", _template_sources.values())
+            self.assertEqual(get_template("{{ x }} evicted").render(x=1), "1 evicted")
+
+    def test_bytecode_cache(self):
+        """
+        With a bytecode cache directory, the compiled template is stored there.
+        """
+        cache_dir = os.path.abspath(self.mktemp())
+
+        template = get_template("{{ x }} cached", bytecode_cache_dir=cache_dir)
+
+        self.assertEqual(template.render(x=1), "1 cached")
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+
 class TestNewsFragmentsOrdering(TestCase):
     """
     Tests to ensure that issues are ordered correctly in the output.
@@ -0,0 +1,192 @@
+import json
+import os
+import time
+
+from pathlib import Path
+
+from twisted.trial.unittest import TestCase
+
+from .._builder import PreparedSection
+from .._cache import FragmentCache, SectionCache, get_fragment_cache, get_section_cache
+from .._settings.load import Config
+
+
+def make_old(path):
+    """
+    Move the modification time of *path* one minute in the past, so it can be
+    cached.
+    """
+    past = time.time() - 60
+    os.utime(path, (past, past))
+    return os.stat(path)
+
+
+class TestFragmentCache(TestCase):
+    def setUp(self):
+        self.directory = self.mktemp()
+        os.makedirs(self.directory)
+        self.cache_path = os.path.join(self.directory, "cache", "fragments.json")
+        self.fragment = os.path.join(self.directory, "123.feature")
+        Path(self.fragment).write_text("Adds levitation")
+
+    def test_round_trip(self):
+        """
+        Cached content is available to the next cache loaded from the same file.
+        """
+        stat = make_old(self.fragment)
+        cache = FragmentCache(self.cache_path, max_entries=10)
+        self.assertIsNone(cache.get(self.fragment, stat))
+
+        cache.put(self.fragment, stat, "Adds levitation")
+        cache.save()
+
+        cache = FragmentCache(self.cache_path, max_entries=10)
+        self.assertEqual(cache.get(self.fragment, stat), "Adds levitation")
+
+    def test_changed_file(self):
+        """
+        An entry isn't used once the modification time or size of the file changes.
+        """
+        stat = make_old(self.fragment)
+        cache = FragmentCache(self.cache_path, max_entries=10)
+        cache.put(self.fragment, stat, "Adds levitation")
+
+        Path(self.fragment).write_text("Adds levitation and flight")
+
+        self.assertIsNone(cache.get(self.fragment, os.stat(self.fragment)))
+
+    def test_recently_modified(self):
+        """
+        Files modified too recently to be told apart from a later change with the
+        same size are not cached.
+        """
+        stat = os.stat(self.fragment)
+        cache = FragmentCache(self.cache_path, max_entries=10)
+        cache.put(self.fragment, stat, "Adds levitation")
+
+        self.assertIsNone(cache.get(self.fragment, stat))
+        self.assertFalse(cache.changed)
+
+    def test_lru_eviction(self):
+        """
+        Once the cache is full, the least recently used entries are evicted.
+        """
+        stat = make_old(self.fragment)
+        cache = FragmentCache(self.cache_path, max_entries=2)
+        cache.put("a", stat, "A")
+        cache.put("b", stat, "B")
+        cache.get("a", stat)
+        cache.put("c", stat, "C")
+        cache.save()
+
+        cache = FragmentCache(self.cache_path, max_entries=2)
+        self.assertEqual(list(cache.entries), ["a", "c"])
+
+    def test_save_unchanged(self):
+        """
+        An unchanged cache isn't written.
+        """
+        FragmentCache(self.cache_path, max_entries=10).save()
+
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_corrupt_cache(self):
+        """
+        A corrupt or outdated cache file is treated as an empty cache.
+        """
+        os.makedirs(os.path.dirname(self.cache_path))
+        for content in [
+            "{",
+            "[]",
+            json.dumps({"signature": "0", "entries": [["a", 0, 0, "A"]]}),
+        ]:
+            Path(self.cache_path).write_text(content)
+
+            self.assertEqual(FragmentCache(self.cache_path, 10).entries, {})
+
+    def test_get_fragment_cache(self):
+        """
+        The cache is disabled unless `cache_dir` is configured.
+        """
+        config = Config(sections={}, types={}, template="", start_string="")
+        self.assertIsNone(get_fragment_cache(self.directory, config))
+
+        config.cache_dir = ".towncrier-cache"
+        config.cache_size = 5
+        cache = get_fragment_cache(self.directory, config)
+        self.assertEqual(
+            cache.path,
+            os.path.join(self.directory, ".towncrier-cache", "fragments.json"),
+        )
+        self.assertEqual(cache.max_entries, 5)
+
+
+class TestSectionCache(TestCase):
+    def setUp(self):
+        self.directory = self.mktemp()
+        os.makedirs(self.directory)
+        self.cache_path = os.path.join(self.directory, "cache", "sections.json")
+        self.fragment = os.path.join(self.directory, "123.feature")
+        Path(self.fragment).write_text("Adds levitation")
+        self.config = Config(sections={"": ""}, types={}, template="", start_string="")
+        self.section = PreparedSection(
+            {"feature": {"Adds levitation": ["#123"]}}, {"feature": ["#123"]}
+        )
+
+    def test_round_trip(self):
+        """
+        A prepared section is available to the next cache loaded from the same
+        file, while its news fragments are unchanged.
+        """
+        make_old(self.fragment)
+        cache = SectionCache(self.cache_path, self.config)
+        key = cache.key([self.fragment])
+        self.assertIsNone(cache.get("", key))
+
+        cache.put("", key, self.section)
+        cache.save()
+
+        cache = SectionCache(self.cache_path, self.config)
+        self.assertEqual(cache.get("", cache.key([self.fragment])), self.section)
+
+        Path(self.fragment).write_text("Adds levitation and flight")
+        make_old(self.fragment)
+        self.assertIsNone(cache.get("", cache.key([self.fragment])))
+
+    def test_recently_modified(self):
+        """
+        Sections with news fragments modified too recently have no key, and aren't
+        cached.
+        """
+        cache = SectionCache(self.cache_path, self.config)
+        self.assertIsNone(cache.key([self.fragment]))
+
+        cache.put("", None, self.section)
+        self.assertEqual(cache.sections, {})
+
+    def test_config_changed(self):
+        """
+        The cached sections are discarded when the configuration changes.
+        """
+        make_old(self.fragment)
+        cache = SectionCache(self.cache_path, self.config)
+        key = cache.key([self.fragment])
+        cache.put("", key, self.section)
+        cache.save()
+
+        self.config.all_bullets = False
+        cache = SectionCache(self.cache_path, self.config)
+        self.assertIsNone(cache.get("", key))
+
+    def test_get_section_cache(self):
+        """
+        The cache is disabled unless `cache_dir` is configured.
+        """
+        self.assertIsNone(get_section_cache(self.directory, self.config))
+
+        self.config.cache_dir = ".towncrier-cache"
+        cache = get_section_cache(self.directory, self.config)
+        self.assertEqual(
+            cache.path,
+            os.path.join(self.directory, ".towncrier-cache", "sections.json"),
+        )
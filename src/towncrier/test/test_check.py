@@ -7,6 +7,7 @@ import warnings
 
 from pathlib import Path
 from subprocess import call
+from unittest.mock import patch
 
 from click.testing import CliRunner
 from twisted.trial.unittest import TestCase
@@ -166,6 +167,30 @@ class TestChecker(TestCase):
                 result.output.endswith("No new newsfragments found on this branch.\n")
             )
 
+    @with_isolated_runner
+    def test_only_fragments_listed(self, runner):
+        """
+        Only the changes to the news fragments and the news file are looked at, so
+        other changed files aren't listed.
+        """
+        create_project("pyproject.toml")
+
+        write("foo/somefile.py", "import os")
+        write("foo/newsfragments/README", "Not a fragment")
+        fragment_path = Path("foo/newsfragments/1234 é.feature").absolute()
+        write(fragment_path, "Adds gravity back")
+        commit("add a newsfragment")
+
+        result = runner.invoke(towncrier_check, ["--compare-with", "main"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertNotIn("somefile.py", result.output)
+        self.assertIn("Looking at these files:\n----\n", result.output)
+        self.assertTrue(
+            result.output.endswith("Found:\n1. " + str(fragment_path) + "\n"),
+            (result.output, str(fragment_path)),
+        )
+
     def test_fragment_exists_but_not_in_check(self):
         """A fragment that exists but is marked as check=False is ignored by the check."""
         runner = CliRunner()
@@ -520,6 +545,30 @@ class TestChecker(TestCase):
         self.assertEqual(1, result.exit_code, result.output)
         self.assertIn("Invalid news fragment name: feature.125", result.output)
 
+    @with_isolated_runner
+    def test_only_changed_fragments_checked(self, runner):
+        """
+        Only the news fragments changed in the branch are looked at, so those
+        already on the main branch aren't read or validated again.
+        """
+        setup_simple_project()
+        write("foo/newsfragments/feature.123", "Already on the main branch")
+        initial_commit()
+        call(["git", "checkout", "-b", "otherbranch"])
+        fragment_path = Path("foo/newsfragments/124.feature").absolute()
+        write(fragment_path, "Adds gravity back")
+        commit("add a newsfragment")
+
+        with patch("towncrier._builder.read_fragment") as read_fragment:
+            result = runner.invoke(towncrier_check, ["--compare-with", "main"])
+        read_fragment.assert_not_called()
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertTrue(
+            result.output.endswith("Found:\n1. " + str(fragment_path) + "\n"),
+            (result.output, str(fragment_path)),
+        )
+
     @with_isolated_runner
     def test_issue_pattern(self, runner):
         """
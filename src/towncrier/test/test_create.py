@@ -238,6 +238,25 @@ class TestCli(TestCase):
         # No '.rst' extension added.
         self.assertEqual(fragments, ["123.feature.txt"])
 
+    @with_isolated_runner
+    def test_ignored_filename(self, runner: CliRunner):
+        """
+        Fragments that would be ignored because of the `ignore` configuration
+        are rejected.
+        """
+        setup_simple_project(extra_config='ignore = ["*.txt"]')
+        frag_path = Path("foo", "newsfragments")
+
+        result = runner.invoke(_main, ["123.feature.TXT"])
+
+        self.assertEqual(result.exit_code, 2, result.output)
+        self.assertIn(
+            "The news fragment name '123.feature.TXT' matches the 'ignore' "
+            "configuration",
+            result.output,
+        )
+        self.assertEqual(list(frag_path.iterdir()), [])
+
     @with_isolated_runner
     def test_md_filename_extension(self, runner: CliRunner):
         """Ensure changelog filename extension is used if .md"""
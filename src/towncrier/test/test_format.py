@@ -462,3 +462,44 @@ Features
             versiondata={"name": "MyProject", "version": "1.0", "date": "never"},
         )
         self.assertEqual(output, expected_output)
+
+    def test_line_wrapping_width(self):
+        """
+        Output is wrapped to the given width.
+        """
+        fragments = {
+            "": {
+                ("1", "feature", 0): "a " * 30,
+                ("2", "feature", 0): "Short enough.",
+            }
+        }
+
+        definitions = {"feature": {"name": "Features", "showcontent": True}}
+
+        expected_output = """MyProject 1.0 (never)
+=====================
+
+Features
+--------
+
+- a a a a a a a a a a a a a a a a a a a
+  a a a a a a a a a a a (#1)
+- Short enough. (#2)
+
+
+"""
+
+        template = read_pkg_resource("templates/default.rst")
+
+        fragments = split_fragments(fragments, definitions)
+        output = render_fragments(
+            template,
+            None,
+            fragments,
+            definitions,
+            ["-", "~"],
+            wrap=True,
+            versiondata={"name": "MyProject", "version": "1.0", "date": "never"},
+            wrap_width=40,
+        )
+        self.assertEqual(output, expected_output)
@@ -1,10 +1,26 @@
 # Copyright (c) Amber Brown, 2015
 # See LICENSE for details.
 
+import os
+
+from pathlib import Path
+from subprocess import (
+    CalledProcessError,
+    CompletedProcess,
+    call,
+    check_call,
+    check_output,
+    run,
+)
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from twisted.trial.unittest import TestCase
 
 from towncrier import _git
+from towncrier._git_reader import GitReader, UnsupportedRepository
+
+from .helpers import with_git_project
 
 
 class TestGit(TestCase):
@@ -13,3 +29,222 @@ class TestGit(TestCase):
         If remove_files gets an empty list, it returns gracefully.
         """
         _git.remove_files([])
+
+    @with_git_project()
+    def test_remove_files(self, runner, commit):
+        """
+        Files tracked by git are removed with `git rm`, in a single call however many
+        there are and whatever their names, and other files are deleted.
+        """
+        tracked = [
+            os.path.abspath(f"foo/newsfragments/{name}")
+            for name in ["1.feature", "2 with spaces.feature", '"quotedé".bugfix']
+        ] + [os.path.abspath(f"foo/newsfragments/{i}.misc") for i in range(500)]
+        for path in tracked:
+            Path(path).write_text("Tracked")
+        commit()
+        untracked = os.path.abspath("foo/newsfragments/3.feature")
+        Path(untracked).write_text("Not tracked")
+
+        _git.remove_files(tracked + [untracked])
+
+        self.assertEqual(os.listdir("foo/newsfragments"), [])
+        self.assertEqual(
+            check_output(["git", "ls-files", "foo/newsfragments"], encoding="utf-8"),
+            "",
+        )
+
+    @with_git_project()
+    def test_remove_files_old_git(self, runner, commit):
+        """
+        With a git older than 2.26, which can't read the paths from stdin, the
+        tracked files are removed with as many `git rm` calls as the command line
+        length requires.
+        """
+        tracked = [os.path.abspath(f"foo/newsfragments/{i}.misc") for i in range(20)]
+        for path in tracked:
+            Path(path).write_text("Tracked")
+        commit()
+
+        def old_run(args, **kwargs):
+            if "--pathspec-from-file=-" in args:
+                return CompletedProcess(args, 129, "error: unknown option")
+            return run(args, **kwargs)
+
+        with patch("towncrier._git.run", side_effect=old_run), patch(
+            "towncrier._git._max_argv_length", return_value=len(tracked[0]) * 5
+        ), patch("towncrier._git.check_call", wraps=check_call) as git_rm:
+            _git.remove_files(tracked)
+
+        self.assertGreater(git_rm.call_count, 1)
+        self.assertFalse(any(map(os.path.exists, tracked)))
+        self.assertEqual(
+            check_output(["git", "ls-files", "foo/newsfragments"], encoding="utf-8"),
+            "",
+        )
+
+    @with_git_project()
+    def test_remove_files_fails(self, runner, commit):
+        """
+        When `git rm` fails, an error is raised instead of leaving the files in
+        place silently.
+        """
+        tracked = os.path.abspath("foo/newsfragments/1.feature")
+        Path(tracked).write_text("Tracked")
+        commit()
+
+        with patch("towncrier._git.run", return_value=CompletedProcess([], 129)), patch(
+            "towncrier._git.check_call", side_effect=CalledProcessError(1, [])
+        ):
+            self.assertRaises(CalledProcessError, _git.remove_files, [tracked])
+
+    def test_argv_batches(self):
+        """
+        Paths are split in batches of arguments no longer than the limit, keeping
+        their order.
+        """
+        paths = ["a" * 11, "b" * 11, "c" * 31, "d"]
+
+        self.assertEqual(
+            list(_git._argv_batches(paths, 40)),
+            [["a" * 11, "b" * 11], ["c" * 31], ["d"]],
+        )
+
+    @with_git_project()
+    def test_remove_files_unsupported_index(self, runner, commit):
+        """
+        When the index can't be read directly, `git ls-files` finds the tracked files.
+        """
+        tracked = os.path.abspath("foo/newsfragments/1.feature")
+        Path(tracked).write_text("Tracked")
+        commit()
+        call(["git", "update-index", "--split-index"])
+
+        _git.remove_files([tracked])
+
+        self.assertFalse(os.path.exists(tracked))
+        self.assertEqual(
+            check_output(["git", "ls-files", "foo/newsfragments"], encoding="utf-8"),
+            "",
+        )
+
+    @with_git_project()
+    def test_get_remote_branches(self, runner, commit):
+        """
+        Loose and packed remote branches are listed like `git branch -r` does.
+        """
+        call(["git", "update-ref", "refs/remotes/origin/main", "HEAD"])
+        call(["git", "update-ref", "refs/remotes/upstream/feature/x", "HEAD"])
+        call(["git", "pack-refs", "--all"])
+        call(["git", "update-ref", "refs/remotes/origin/release-1", "HEAD"])
+        call(
+            [
+                "git",
+                "symbolic-ref",
+                "refs/remotes/origin/HEAD",
+                "refs/remotes/origin/main",
+            ]
+        )
+        expected = [
+            "origin/HEAD -> origin/main",
+            "origin/main",
+            "origin/release-1",
+            "upstream/feature/x",
+        ]
+
+        self.assertEqual(_git.get_remote_branches("."), expected)
+        self.assertEqual(GitReader.discover("foo").remote_branches(), expected)
+
+
+class TestGitReader(TestCase):
+    def assertTrackedFiles(self, reader):
+        tracked = check_output(["git", "ls-files", "-z"], encoding="utf-8")
+        self.assertEqual(
+            reader.tracked_files(),
+            {os.path.abspath(path) for path in tracked.split("\0") if path},
+        )
+
+    @with_git_project()
+    def test_tracked_files(self, runner, commit):
+        """
+        The files in the index are the ones listed by `git ls-files`, whatever the
+        length of their names and the version of the index.
+        """
+        names = ["a", "é.rst", "x" * 100, "/".join(["y" * 250] * 12), "sub/dir/z"]
+        for name in names:
+            os.makedirs(os.path.dirname(os.path.join("foo", name)), exist_ok=True)
+            Path("foo", name).write_text(name)
+        commit()
+
+        for version in ["2", "3", "4"]:
+            call(["git", "update-index", "--index-version", version])
+            self.assertTrackedFiles(GitReader.discover("foo/sub"))
+
+        call(["git", "update-index", "--index-version", "3"])
+        call(["git", "update-index", "--skip-worktree", "foo/a"])
+        self.assertTrackedFiles(GitReader.discover("."))
+
+    @with_git_project()
+    def test_linked_worktree(self, runner, commit):
+        """
+        Linked work trees use their own index and the references of the main
+        repository.
+        """
+        call(["git", "update-ref", "refs/remotes/origin/main", "HEAD"])
+        call(["git", "worktree", "add", "-q", "linked"])
+        os.chdir("linked")
+        Path("new.txt").write_text("New")
+        call(["git", "add", "new.txt"])
+
+        reader = GitReader.discover(".")
+
+        self.assertEqual(reader.work_tree, os.getcwd())
+        self.assertTrackedFiles(reader)
+        self.assertEqual(reader.remote_branches(), ["origin/main"])
+
+    @with_git_project()
+    def test_unsupported(self, runner, commit):
+        """
+        Repositories using features that aren't understood are reported as
+        unsupported.
+        """
+        call(["git", "update-index", "--split-index"])
+        with self.assertRaises(UnsupportedRepository):
+            GitReader.discover(".").tracked_files()
+        call(["git", "update-index", "--no-split-index"])
+
+        call(["git", "config", "core.ignoreCase", "true"])
+        with self.assertRaises(UnsupportedRepository):
+            GitReader.discover(".")
+        call(["git", "config", "core.ignoreCase", "false"])
+
+        call(["git", "config", "extensions.worktreeConfig", "true"])
+        with self.assertRaises(UnsupportedRepository):
+            GitReader.discover(".")
+
+    @with_git_project()
+    def test_disabled(self, runner, commit):
+        """
+        With the TOWNCRIER_NO_GIT_READER environment variable, the repository is
+        unsupported, so git is run instead.
+        """
+        tracked = os.path.abspath("foo/newsfragments/1.feature")
+        Path(tracked).write_text("Tracked")
+        commit()
+
+        with patch.dict(os.environ, {"TOWNCRIER_NO_GIT_READER": "1"}):
+            with self.assertRaises(UnsupportedRepository):
+                GitReader.discover(".")
+            with patch("towncrier._git.check_output", wraps=check_output) as git:
+                _git.remove_files([tracked])
+
+        git.assert_called_once()
+        self.assertFalse(os.path.exists(tracked))
+
+    def test_not_a_repository(self):
+        """
+        Directories outside of a git repository are unsupported.
+        """
+        with TemporaryDirectory() as path:
+            with self.assertRaises(UnsupportedRepository):
+                GitReader.discover(path)
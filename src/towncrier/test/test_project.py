@@ -1,15 +1,18 @@
 # Copyright (c) Amber Brown, 2015
 # See LICENSE for details.
 
+import importlib.metadata
 import os
 import sys
 
 from importlib.metadata import version as metadata_version
+from unittest.mock import patch
 
 from click.testing import CliRunner
 from twisted.trial.unittest import TestCase
 
-from .._project import get_project_name, get_version
+from .. import _project
+from .._project import ProjectMetadata, get_project_name, get_version
 from .._shell import cli as towncrier_cli
 from .helpers import write
 
@@ -77,6 +80,126 @@ __version__ = Version(1, 3, 12, "rc1")
         project = get_project_name(temp, "mytestprojinc")
         self.assertEqual(project, "mytestprojinc")
 
+    def test_static_version_not_imported(self):
+        """
+        A literal __version__ is read from the source, without importing the
+        package.
+        """
+        temp = self.mktemp()
+        os.makedirs(os.path.join(temp, "mytestprojstatic"))
+        write(
+            os.path.join(temp, "mytestprojstatic", "__init__.py"),
+            "__version__ = '4.5.6'\nraise RuntimeError('Imported')\n",
+        )
+
+        self.assertEqual(get_version(temp, "mytestprojstatic"), "4.5.6")
+        self.assertEqual(get_project_name(temp, "mytestprojstatic"), "Mytestprojstatic")
+        self.assertNotIn("mytestprojstatic", sys.modules)
+
+    def test_static_incremental_version_module(self):
+        """
+        An Incremental Version imported from the `_version` module is read from the
+        source, along with the project name.
+        """
+        temp = self.mktemp()
+        os.makedirs(os.path.join(temp, "mytestprojstaticinc"))
+        write(
+            os.path.join(temp, "mytestprojstaticinc", "__init__.py"),
+            "from ._version import __version__\nraise RuntimeError('Imported')\n",
+        )
+        write(
+            os.path.join(temp, "mytestprojstaticinc", "_version.py"),
+            "from incremental import Version\n"
+            "__version__ = Version('StaticInc', 1, 3, 12, release_candidate=1)\n",
+        )
+
+        self.assertEqual(get_version(temp, "mytestprojstaticinc"), "1.3.12rc1")
+        self.assertEqual(get_project_name(temp, "mytestprojstaticinc"), "StaticInc")
+
+    def test_static_version_overridden(self):
+        """
+        A literal __version__ that may be replaced when the package is imported,
+        by an import or an augmented assignment, isn't read from the source.
+        """
+        temp = self.mktemp()
+        os.makedirs(os.path.join(temp, "mytestprojoverridden"))
+        write(
+            os.path.join(temp, "mytestprojoverridden", "__init__.py"),
+            "__version__ = '0.0.0'\n"
+            "try:\n"
+            "    from ._version import __version__\n"
+            "except ImportError:\n"
+            "    pass\n",
+        )
+        write(
+            os.path.join(temp, "mytestprojoverridden", "_version.py"),
+            "__version__ = '2.5.1'\n",
+        )
+        os.makedirs(os.path.join(temp, "mytestprojaugmented"))
+        write(
+            os.path.join(temp, "mytestprojaugmented", "__init__.py"),
+            "__version__ = '1.0'\n__version__ += '.post1'\n",
+        )
+
+        self.assertIsNone(_project._get_static_version(temp, "mytestprojoverridden"))
+        self.assertEqual(get_version(temp, "mytestprojoverridden"), "2.5.1")
+        self.assertIsNone(_project._get_static_version(temp, "mytestprojaugmented"))
+        self.assertEqual(get_version(temp, "mytestprojaugmented"), "1.0.post1")
+
+    def test_dynamic_version_imported(self):
+        """
+        A __version__ that isn't a literal is found by importing the package.
+        """
+        temp = self.mktemp()
+        os.makedirs(os.path.join(temp, "mytestprojdynamic"))
+        write(
+            os.path.join(temp, "mytestprojdynamic", "__init__.py"),
+            "__version__ = '.'.join(['7', '8'])\n",
+        )
+
+        self.assertEqual(get_version(temp, "mytestprojdynamic"), "7.8")
+        self.assertIn("mytestprojdynamic", sys.modules)
+
+    def test_resolved_once(self):
+        """
+        The version and the name of a project share a single parse of the source
+        and a single import of the package.
+        """
+        temp = self.mktemp()
+        os.makedirs(os.path.join(temp, "mytestprojonce"))
+        write(
+            os.path.join(temp, "mytestprojonce", "__init__.py"),
+            "__version__ = '.'.join(['7', '9'])\n",
+        )
+        project = ProjectMetadata(temp, "mytestprojonce")
+
+        with patch(
+            "towncrier._project._get_package", wraps=_project._get_package
+        ) as get_package, patch(
+            "towncrier._project._get_static_version",
+            wraps=_project._get_static_version,
+        ) as get_static_version:
+            self.assertEqual(project.version, "7.9")
+            self.assertEqual(project.name, "Mytestprojonce")
+
+        get_package.assert_called_once()
+        get_static_version.assert_called_once()
+
+    def test_metadata_version_cached(self):
+        """
+        The distribution metadata of a package is only looked up once.
+        """
+        _project._get_metadata_version.cache_clear()
+        self.addCleanup(_project._get_metadata_version.cache_clear)
+
+        with patch(
+            "importlib.metadata.version", wraps=importlib.metadata.version
+        ) as version:
+            get_version(".", "towncrier")
+            get_version(".", "towncrier")
+
+        version.assert_called_once_with("towncrier")
+
     def test_not_incremental(self):
         """
         An exception is raised when the version could not be detected.
@@ -3,10 +3,13 @@
 
 import os
 
+from unittest.mock import patch
+
 from click.testing import CliRunner
 from twisted.trial.unittest import TestCase
 
-from .._settings import ConfigError, load_config
+from .._settings import ConfigError, clear_config_cache, load_config
+from .._settings.load import traverse_for_config
 from .._shell import cli
 from .helpers import with_isolated_runner, write
 
@@ -160,6 +163,23 @@ class TomlSettingsTests(TestCase):
 
         self.assertEqual(e.exception.failing_option, "all_bullets")
 
+    def test_incorrect_jobs(self):
+        """
+        jobs must be a positive integer.
+        """
+        for value in ['"2"', "0", "true"]:
+            project_dir = self.mktemp_project(
+                pyproject_toml=f"""
+                    [tool.towncrier]
+                    jobs = {value}
+                """
+            )
+
+            with self.assertRaises(ConfigError) as e:
+                load_config(project_dir)
+
+            self.assertEqual(e.exception.failing_option, "jobs")
+
     def test_mistype_singlefile(self):
         """
         singlefile is not accepted, single_file is.
@@ -176,6 +196,70 @@ class TomlSettingsTests(TestCase):
 
         self.assertEqual(e.exception.failing_option, "singlefile")
 
+    def test_missing_not_parsed(self):
+        """
+        Config files that don't mention towncrier at all aren't parsed, and are
+        reported the same way as the ones without the correct toml key.
+        """
+        project_dir = self.mktemp_project(
+            pyproject_toml="""
+                [something.else]
+                blah='baz'
+            """
+        )
+
+        with patch("towncrier._settings.load.tomllib.loads") as loads:
+            with self.assertRaises(ConfigError) as e:
+                load_config(project_dir)
+        loads.assert_not_called()
+
+        self.assertEqual(e.exception.failing_option, "all")
+        self.assertEqual(str(e.exception), "No [tool.towncrier] section.")
+
+    def test_traverse_cache(self):
+        """
+        With the cache, traversing from the same directory again doesn't look for
+        the config file again, unless the config file changed.
+        """
+        # The types are changed below, so they mustn't be the shared default ones.
+        project_dir = self.mktemp_project(
+            pyproject_toml="""
+                [tool.towncrier]
+                package = "a"
+
+                [tool.towncrier.fragment.feature]
+                name = "Features"
+            """
+        )
+        start_dir = os.path.join(project_dir, "deep", "path")
+        os.makedirs(start_dir)
+        self.addCleanup(clear_config_cache)
+
+        base_dir, config = traverse_for_config(start_dir, cache=True)
+        self.assertEqual(base_dir, os.path.abspath(project_dir))
+        self.assertEqual(config.package, "a")
+        config.package = "changed by the caller"
+        config.types["feature"]["name"] = "Changed"
+        config.sections["Changed"] = "changed"
+
+        with patch("towncrier._settings.load.load_config_from_file") as load:
+            cached = traverse_for_config(start_dir, cache=True)[1]
+        load.assert_not_called()
+        self.assertEqual(cached.package, "a")
+        self.assertEqual(cached.types["feature"]["name"], "Features")
+        self.assertEqual(cached.sections, {"": ""})
+
+        write(
+            os.path.join(project_dir, "pyproject.toml"),
+            '[tool.towncrier]\npackage = "bb"\n',
+        )
+        self.assertEqual(traverse_for_config(start_dir, cache=True)[1].package, "bb")
+
+        # Without the cache, the config file is always loaded.
+        with patch("towncrier._settings.load.load_config_from_file") as load:
+            traverse_for_config(start_dir)
+        load.assert_called_once()
+
     def test_towncrier_toml_preferred(self):
         """
         Towncrier prefers the towncrier.toml for autodetect over pyproject.toml.
@@ -0,0 +1,147 @@
+import os
+import pstats
+import sys
+
+from subprocess import STDOUT, check_output
+
+import click
+
+from click.testing import CliRunner
+from twisted.trial.unittest import TestCase
+
+from .._shell import cli
+from ..click_default_group import DefaultGroup
+from .helpers import with_git_project, with_project
+
+
+def imported_modules(module):
+    """
+    Return the modules imported by a fresh interpreter importing *module*, with the
+    time spent importing each of them in microseconds, as reported by
+    ``python -X importtime``.
+    """
+    output = check_output(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        encoding="utf-8",
+        stderr=STDOUT,
+    )
+    modules = {}
+    for line in output.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartup(TestCase):
+    def test_shell_imports(self):
+        """
+        Starting the command line interface doesn't import any of the commands, nor
+        the dependencies only some of them need.
+        """
+        modules = imported_modules("towncrier._shell")
+
+        for module in [
+            "towncrier.build",
+            "towncrier.check",
+            "towncrier.create",
+            "towncrier._builder",
+            "jinja2",
+        ]:
+            self.assertNotIn(module, modules)
+        # The import time of the interface is mostly the one of click.
+        self.assertLess(modules["towncrier._shell"], 2 * modules["click"] + 100_000)
+
+    def test_check_imports(self):
+        """
+        The check and create commands don't import jinja, which is only needed for
+        rendering.
+        """
+        for command in ["towncrier.check", "towncrier.create"]:
+            modules = imported_modules(command)
+
+            self.assertIn("towncrier._builder", modules)
+            self.assertNotIn("jinja2", modules)
+            self.assertNotIn("towncrier.build", modules)
+
+
+class TestLazyCommands(TestCase):
+    def test_lazy_command(self):
+        """
+        Lazy commands are listed with the others, and only imported when invoked.
+        """
+        group = DefaultGroup(
+            "cli",
+            default="build",
+            lazy_commands={"build": "towncrier.build:_main"},
+        )
+        group.add_command(click.Command("other", help="Other command."))
+
+        self.assertEqual(group.list_commands(click.Context(group)), ["build", "other"])
+        self.assertEqual(list(group.commands), ["other"])
+
+        with click.Context(group) as ctx:
+            command = group.get_command(ctx, "build")
+        self.assertEqual(command.name, "build")
+        self.assertIs(group.commands["build"], command)
+
+    @with_project()
+    def test_default_lazy_command(self, runner):
+        """
+        Options of the default command resolve to it, even when it's lazy.
+        """
+        result = runner.invoke(cli, ["--draft", "--name", "foo"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("Draft only", result.output)
+
+    def test_help(self):
+        """
+        The help lists every command, marking the default one.
+        """
+        result = CliRunner().invoke(cli, ["--help"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("build*", result.output)
+        self.assertIn("check ", result.output)
+        self.assertIn("create ", result.output)
+
+
+class TestProfile(TestCase):
+    def profiled_functions(self, path):
+        """
+        Return the names of the functions of towncrier in the profile at *path*.
+        """
+        stats = pstats.Stats(path)
+        return {(os.path.basename(filename), name) for filename, _, name in stats.stats}
+
+    @with_project()
+    def test_profile_command(self, runner):
+        """
+        --profile-output writes the cProfile stats of the selected command.
+        """
+        result = runner.invoke(
+            cli,
+            ["--profile-output", "out.prof", "create", "123.feature", "-c", "Foo"],
+        )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn(("create.py", "__main"), self.profiled_functions("out.prof"))
+
+    @with_git_project()
+    def test_profile_default_command(self, runner, commit):
+        """
+        The default command is profiled, including when only --profile-output is
+        passed.
+        """
+        result = runner.invoke(
+            cli, ["--profile-output", "draft.prof", "--draft", "--name", "foo"]
+        )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn(("build.py", "__main"), self.profiled_functions("draft.prof"))
+
+        result = runner.invoke(cli, ["--profile-output", "build.prof"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("Done!", result.output)
+        self.assertIn(("build.py", "__main"), self.profiled_functions("build.prof"))
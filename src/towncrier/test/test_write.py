@@ -5,12 +5,14 @@ import os
 
 from pathlib import Path
 from textwrap import dedent
+from unittest import SkipTest
+from unittest.mock import patch
 
 from click.testing import CliRunner
 from twisted.trial.unittest import TestCase
 
 from .._builder import render_fragments, split_fragments
-from .._writer import append_to_newsfile
+from .._writer import Release, append_to_newsfile, find_releases
 from ..build import _main
 from .helpers import read_pkg_resource, write
 
@@ -256,6 +258,236 @@ Old text.
 
         self.assertEqual(expected_output, output)
 
+    def test_streamed_in_chunks(self):
+        """
+        Existing news files are processed in chunks, even when the start string
+        and the release header straddle them.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        news_file.write_text(
+            "Release notes\n\n\n.. towncrier release notes start\n\n"
+            "Old 1.0\n=======\n\nOld text.\n"
+        )
+
+        with patch("towncrier._writer._CHUNK_SIZE", 4):
+            append_to_newsfile(
+                tempdir,
+                "NEWS.rst",
+                ".. towncrier release notes start\n",
+                "New 2.0",
+                "New 2.0\n=======\n\nNew text.\n\n\n",
+                single_file=True,
+            )
+
+            self.assertEqual(
+                news_file.read_text(),
+                "Release notes\n\n.. towncrier release notes start\n\n"
+                "New 2.0\n=======\n\nNew text.\n\n\n"
+                "Old 1.0\n=======\n\nOld text.\n",
+            )
+
+            with self.assertRaises(ValueError):
+                append_to_newsfile(
+                    tempdir,
+                    "NEWS.rst",
+                    ".. towncrier release notes start\n",
+                    "Old 1.0",
+                    "Old 1.0\n=======\n\nOld text again.\n",
+                    single_file=True,
+                )
+
+    def test_replaced_atomically(self):
+        """
+        The news file is replaced by a new file that keeps the original file mode,
+        and no temporary file is left behind when writing fails.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        news_file.write_text(".. start\n\nOld text.\n")
+        news_file.chmod(0o640)
+
+        append_to_newsfile(
+            tempdir, "NEWS.rst", ".. start\n", "", "New text.\n", single_file=True
+        )
+
+        self.assertEqual(
+            news_file.read_text(), "\n\n.. start\n\nNew text.\nOld text.\n"
+        )
+        self.assertEqual(news_file.stat().st_mode & 0o777, 0o640)
+
+        with patch("shutil.copyfileobj", side_effect=OSError("Disk full")):
+            with self.assertRaises(OSError):
+                append_to_newsfile(
+                    tempdir,
+                    "NEWS.rst",
+                    ".. start\n",
+                    "",
+                    "Newer text.\n",
+                    single_file=True,
+                )
+
+        self.assertEqual(os.listdir(tempdir), ["NEWS.rst"])
+        self.assertEqual(
+            news_file.read_text(), "\n\n.. start\n\nNew text.\nOld text.\n"
+        )
+
+    def test_closed_before_replace(self):
+        """
+        The news file is closed before it's replaced, as Windows can't replace an
+        open file.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        news_file.write_text(".. start\n\nOld text.\n")
+        opened = []
+        path_open = Path.open
+        replace = os.replace
+
+        def open_news_file(path, *args, **kwargs):
+            f = path_open(path, *args, **kwargs)
+            opened.append(f)
+            return f
+
+        def replace_closed(src, dst):
+            self.assertTrue(opened)
+            self.assertTrue(all(f.closed for f in opened))
+            replace(src, dst)
+
+        with patch.object(Path, "open", open_news_file), patch(
+            "towncrier._writer.os.replace", side_effect=replace_closed
+        ) as os_replace:
+            append_to_newsfile(
+                tempdir, "NEWS.rst", ".. start\n", "", "New text.\n", single_file=True
+            )
+
+        os_replace.assert_called_once()
+        self.assertEqual(
+            news_file.read_text(), "\n\n.. start\n\nNew text.\nOld text.\n"
+        )
+
+    def test_symlinked_news_file(self):
+        """
+        When the news file is a symbolic link, its target is updated.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(os.path.join(tempdir, "docs"))
+        target = Path(tempdir, "docs", "changes.rst")
+        target.write_text("Old text.\n")
+        try:
+            os.symlink(
+                os.path.join("docs", "changes.rst"), os.path.join(tempdir, "NEWS.rst")
+            )
+        except (OSError, NotImplementedError):
+            raise SkipTest("Symbolic links are not supported.")
+
+        append_to_newsfile(
+            tempdir, "NEWS.rst", ".. start\n", "", "New text.\n", single_file=True
+        )
+
+        self.assertTrue(os.path.islink(os.path.join(tempdir, "NEWS.rst")))
+        self.assertEqual(target.read_text(), "New text.\nOld text.\n")
+
+    def test_find_releases(self):
+        """
+        Release titles are found by matching whole lines against the title format.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        text = (
+            "Release notes\n\n.. towncrier release notes start\n\n"
+            "Foo 2.0 (2024-02-01)\n====================\n\n"
+            "- Fixed the Foo 1.0 (2024-01-01) release.\n\n"
+            "Foo 1.0 (2024-01-01)\n====================\n"
+        )
+        news_file.write_text(text)
+
+        releases = find_releases(news_file, "{name} {version} ({project_date})")
+
+        self.assertEqual(
+            releases,
+            [
+                Release("Foo 2.0 (2024-02-01)", "Foo", "2.0", "2024-02-01"),
+                Release("Foo 1.0 (2024-01-01)", "Foo", "1.0", "2024-01-01"),
+            ],
+        )
+        self.assertEqual(
+            [release.version for release in find_releases(news_file, "Bar {version}")],
+            [],
+        )
+        self.assertEqual(
+            find_releases(
+                news_file,
+                "Foo {version} ({project_date})",
+                start=text.index("- Fixed"),
+            ),
+            [Release("Foo 1.0 (2024-01-01)", None, "1.0", "2024-01-01")],
+        )
+
+    def test_find_releases_in_chunks(self):
+        """
+        Release titles straddling the chunks the news file is read in are found,
+        and so are duplicate releases.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        news_file.write_text(
+            ".. start\n\n  Foo 2.0 (2024-02-01)  \n====\n\nFoo 1.0 (2024-01-01)"
+        )
+
+        with patch("towncrier._writer._CHUNK_SIZE", 5):
+            releases = find_releases(news_file, "{name} {version} ({project_date})")
+            with self.assertRaises(ValueError):
+                append_to_newsfile(
+                    tempdir,
+                    "NEWS.rst",
+                    ".. start\n",
+                    "Foo 1.0 (2024-01-01)",
+                    "",
+                    single_file=True,
+                    title_format="{name} {version} ({project_date})",
+                )
+
+        self.assertEqual(
+            [release.title for release in releases],
+            ["Foo 2.0 (2024-02-01)", "Foo 1.0 (2024-01-01)"],
+        )
+
+    def test_title_in_text_is_not_a_release(self):
+        """
+        A release title mentioned inside some text doesn't count as a release.
+        """
+        tempdir = self.mktemp()
+        os.makedirs(tempdir)
+        news_file = Path(tempdir, "NEWS.rst")
+        news_file.write_text(".. start\n\n- Prepare for Foo 2.0 (2024-02-01).\n")
+
+        append_to_newsfile(
+            tempdir,
+            "NEWS.rst",
+            ".. start\n",
+            "Foo 2.0 (2024-02-01)",
+            "Foo 2.0 (2024-02-01)\n====================\n\n",
+            single_file=True,
+            title_format="{name} {version} ({project_date})",
+        )
+
+        with self.assertRaises(ValueError):
+            append_to_newsfile(
+                tempdir,
+                "NEWS.rst",
+                ".. start\n",
+                "Foo 2.0 (2024-02-01)",
+                "Foo 2.0 (2024-02-01)\n====================\n\n",
+                single_file=True,
+                title_format="{name} {version} ({project_date})",
+            )
+
     def test_with_title_format_duplicate_version_raise(self):
         """
         When `single_file` enabled as default,